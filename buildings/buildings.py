@@ -5,7 +5,7 @@ import random
 from collections import deque
 from functools import partial, cached_property
 from pathlib import Path
-from typing import Deque, List, Optional, Set, Tuple, Dict, Union, Iterable
+from typing import Callable, Deque, List, Optional, Set, Tuple, Dict, Union, Iterable
 
 from arcade import load_texture, MOUSE_BUTTON_RIGHT
 from arcade.arcade_types import Point
@@ -44,6 +44,7 @@ class UnitsProducer:
     player: Player
     center_x: float
     center_y: float
+    production_updates: List[Callable[[float], None]]
 
     def __init__(self, produced_units: Tuple[str]):
         # Units which are available to produce in this Building and their costs in resources:
@@ -77,6 +78,7 @@ class UnitsProducer:
             if self.currently_produced is None:
                 self._start_production(unit_name, confirmation=True)
             self.production_queue.appendleft(unit_name)
+            self.toggle_units_production_update()
 
     def _start_production(self, unit_name: str, confirmation=False):
         self.set_production_progress_and_speed(unit_name)
@@ -98,6 +100,7 @@ class UnitsProducer:
             if unit_name == self.currently_produced and unit_name not in queue:
                 self._set_currently_produced_to(None)
                 self.production_progress = 0.0
+            self.toggle_units_production_update()
         if self.player.is_human_player:
             self.update_ui_units_construction_section()
 
@@ -126,6 +129,18 @@ class UnitsProducer:
     def _set_currently_produced_to(self, produced: Optional[str]):
         self.currently_produced = produced
 
+    def toggle_units_production_update(self):
+        """
+        Idle UnitsProducer is not updated each frame, until any Unit is
+        enqueued for production.
+        """
+        update = self.update_units_production
+        updates = [u for u in self.production_updates if u != update]
+        if self.currently_produced is not None or self.production_queue:
+            updates.append(update)
+        # a new list is assigned, since this could be called during iteration of the old one:
+        self.production_updates = updates
+
     def update_units_production(self, delta_time: float):
         if self.currently_produced is not None and self.is_powered:
             power_ratio = clamp(self.power_ratio + self.player.unlimited_resources, 1, 0)
@@ -157,6 +172,7 @@ class UnitsProducer:
     def finish_production(self, finished_unit_name: str):
         self.production_progress = 0
         self._set_currently_produced_to(None)
+        self.toggle_units_production_update()
         self.clear_spawning_point_for_new_unit()
         self.spawn_finished_unit(finished_unit_name)
         if self.player.is_human_player:
@@ -196,6 +212,7 @@ class UnitsProducer:
         self.production_progress = state['production_progress']
         self.currently_produced = state['currently_produced']
         self.production_time = state['production_time']
+        self.toggle_units_production_update()
 
 
 class ResourceProducer:
@@ -235,6 +252,9 @@ class ResearchFacility:
         self.required_funding = 0
         self.researched_technologies: Dict[Technology, float] = {}
         self.researched_technology = None
+        # progress of each researched Technology made in one second, recalculated only when funding or scientists
+        # change, instead of each frame:
+        self.research_progress_per_second: Dict[Technology, float] = {}
 
     def start_research(self, technology: Technology):
         if self.player.knows_all_required(technology.required):
@@ -243,32 +263,43 @@ class ResearchFacility:
             self.update_scientists_efficiency()
 
     def update_scientists_efficiency(self):
-        self.scientists_per_technology = (self.scientists / len(
-            self.researched_technologies)) / self.optimal_scientists_per_technology
+        if self.researched_technologies:
+            self.scientists_per_technology = (self.scientists / len(
+                self.researched_technologies)) / self.optimal_scientists_per_technology
+        else:
+            self.scientists_per_technology = 0
+        self.update_research_progress_per_second()
 
     def change_funding(self, value: int):
         self.funding += value
+        self.update_research_progress_per_second()
+
+    def update_research_progress_per_second(self):
+        funding_factor = self.funding / self.required_funding if self.required_funding else 1
+        power_factor = 1
+        research_speed = self.scientists_per_technology * funding_factor * power_factor
+        self.research_progress_per_second = {
+            technology: research_speed / technology.difficulty for technology in self.researched_technologies
+        }
 
     def update_research(self, delta_time: float):
         if not self.researched_technologies:
             return
         finished_technologies = []
-        for technology in self.researched_technologies:
-            funding_factor = (self.funding / self.required_funding)
-            power_factor = 1
-            progress = (self.scientists_per_technology * funding_factor * power_factor) / technology.difficulty
-            total_progress = self.researched_technologies.get(technology, 0) + (progress * delta_time)
+        for technology, progress in self.research_progress_per_second.items():
+            total_progress = self.researched_technologies[technology] + progress * delta_time
             if total_progress >= 100:
                 finished_technologies.append(technology)
             else:
                 self.researched_technologies[technology] = total_progress
-        self.finish_research(finished_technologies)
+        if finished_technologies:
+            self.finish_research(finished_technologies)
 
     def finish_research(self, finished_technologies: Iterable[Technology]):
         for technology in finished_technologies:
             del self.researched_technologies[technology]
             self.required_funding -= technology.funding_cost
-            self.owner.update_known_technologies(technology)
+            self.player.update_known_technologies(technology)
         self.update_scientists_efficiency()
 
     def save(self) -> Dict:
@@ -282,7 +313,8 @@ class ResearchFacility:
     def after_respawn(self, state: Dict):
         self.__dict__.update(state)
         if (tech_name := state['researched_technology']) is not None:
-            self.researched_technology = self.owner.game.window.configs[tech_name]
+            self.researched_technology = self.game.configs[tech_name]
+        self.update_research_progress_per_second()
 
 
 class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
@@ -303,6 +335,9 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
         :param position: Point -- coordinates of the center (x, y)
         :param produces:
         """
+        if object_id is None:
+            # Sprite and its QuadTree entry are created at the final position, instead of being moved after:
+            position = self.place_building_properly_on_the_grid(position)
         PlayerEntity.__init__(self, building_name, player, position, object_id)
         self.produced_units = produced_units
         self.produced_resource = produced_resource
@@ -313,14 +348,25 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
         if produced_resource is not None:
             ResourceProducer.__init__(self, produced_resource)
         if research_facility:
-            ResearchFacility(building=self)
-
-        if object_id is None:
-            self.place_building_properly_on_the_grid()
+            ResearchFacility.__init__(self)
+        # each role of the Building saves and restores its own state:
+        self.roles: Tuple[type, ...] = tuple(
+            role for role, has_role in (
+                (UnitsProducer, produced_units is not None),
+                (ResourceProducer, produced_resource is not None),
+                (ResearchFacility, research_facility)
+            ) if has_role
+        )
+        # only these roles, which the Building actually has, are updated each frame:
+        self.production_updates: List[Callable[[float], None]] = self.find_production_updates()
 
         self.occupied_nodes: Set[MapNode] = self.find_occupied_nodes()
         self.block_map_nodes(self.occupied_nodes)
 
+        # Buildings never move, so their observed area is calculated and registered in the FogOfWar only once:
+        self.update_observed_area()
+        self.register_in_fog_of_war()
+
         self.garrisoned_soldiers: List[Union[Soldier, int]] = []
         self.garrison_size: int = self.configs['garrison_size']
 
@@ -354,18 +400,16 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
 
     @cached_property
     def adjacent_nodes(self) -> List[MapNode]:
-        b_adjacent = []
-        for adjacent in (n.adjacent_nodes for n in self.occupied_nodes):
-            b_adjacent.extend([b for b in adjacent if b not in self.occupied_nodes])
-        return b_adjacent
+        adjacent = set().union(*(n.adjacent_nodes for n in self.occupied_nodes))
+        return list(adjacent - self.occupied_nodes)
 
-    def place_building_properly_on_the_grid(self) -> Point:
+    @staticmethod
+    def place_building_properly_on_the_grid(position: Point) -> Point:
         """
         Buildings positions must be adjusted accordingly to their texture
         width and height, so they occupy minimum MapNodes.
         """
-        self.position = normalized = normalize_position(*self.position)
-        return normalized
+        return normalize_position(*position)
 
     def find_occupied_nodes(self) -> Set[MapNode]:
         min_x_grid = int(self.left // TILE_WIDTH)
@@ -373,11 +417,7 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
         width, height = self.configs.get('size')
         max_x_grid = min_x_grid + width
         max_y_grid = min_y_grid + height
-        return {
-            self.game.map.grid_to_node((x, y))
-            for x in range(min_x_grid, max_x_grid)
-            for y in range(min_y_grid, max_y_grid)
-        }
+        return self.game.map.nodes_in_area(min_x_grid, min_y_grid, max_x_grid, max_y_grid)
 
     def block_map_nodes(self, occupied_nodes: Set[MapNode]):
         for node in occupied_nodes:
@@ -402,9 +442,19 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
         node.building = self
 
     def update_observed_area(self, *args, **kwargs):
-        if not self.observed_nodes:  # Building need calculate it only once
-            self.observed_grids = grids = self.calculate_observed_area()
-            self.observed_nodes = {self.map[grid] for grid in grids}
+        self.observed_grids = grids = self.calculate_observed_area()
+        self.observed_nodes = {self.map[grid] for grid in grids}
+
+    def register_in_fog_of_war(self):
+        if self.is_controlled_by_human_player and self.game.fog_of_war is not None:
+            self.game.fog_of_war.register_static_observer(self.observed_grids)
+
+    def unregister_from_fog_of_war(self):
+        if self.is_controlled_by_human_player and self.game.fog_of_war is not None:
+            self.game.fog_of_war.unregister_static_observer(self.observed_grids)
+
+    def reveal_observed_area(self):
+        pass  # Building is a static observer of the FogOfWar
 
     @ignore_in_editor_mode
     def update_battle_behaviour(self):
@@ -432,7 +482,6 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
     def on_update(self, delta_time: float = 1 / 60):
         super().on_update(delta_time)
         self.update_production(delta_time)
-        self.update_observed_area()
         self.update_ui_buildings_panel()
         if self.autodestruction_progress:
             self.update_autodestruction()
@@ -446,13 +495,18 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
     def draw(self):
         ...
 
-    def update_production(self, delta_time):
-        if self.produced_units is not None:
-            self.update_units_production(delta_time)
+    def find_production_updates(self) -> List[Callable[[float], None]]:
+        # UnitsProducer adds its update only when something is enqueued, see toggle_units_production_update:
+        updates = []
         if self.produced_resource not in (None, ENERGY):
-            self.update_resource_production(delta_time)
+            updates.append(self.update_resource_production)
         if self.research_facility:
-            self.update_research(delta_time)
+            updates.append(self.update_research)
+        return updates
+
+    def update_production(self, delta_time):
+        for update in self.production_updates:
+            update(delta_time)
 
     @ignore_in_editor_mode
     def update_ui_buildings_panel(self):
@@ -564,7 +618,10 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
     def reconfigure_building(self, player: Player):
         self.clear_known_enemies()
         self.remove_from_map_quadtree()
+        # observed area is registered in the FogOfWar only for the human Player's Buildings:
+        self.unregister_from_fog_of_war()
         self.change_player(player)
+        self.register_in_fog_of_war()
         self.insert_to_map_quadtree()
         self.change_building_texture(player)
 
@@ -586,6 +643,8 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
     def change_player(self, new_player: Player):
         self.detach(self.player)
         self.attach(new_player)
+        # cached_property of the previous owner would be used by the FogOfWar registration:
+        self.__dict__.pop('is_controlled_by_human_player', None)
         self.player.recalculate_energy_balance()
 
     def update_garrison_button(self):
@@ -611,6 +670,7 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
         if self.garrisoned_soldiers:
             self.kill_garrisoned_soldiers()
         self.unblock_occupied_nodes()
+        self.unregister_from_fog_of_war()
         super().kill()
 
     def unblock_occupied_nodes(self):
@@ -624,12 +684,8 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
 
     def save(self) -> Dict:
         saved_building = super().save()
-        if self.produced_units is not None:
-            saved_building.update(UnitsProducer.save(self))
-        elif self.produced_resource is not None:
-            saved_building.update(ResourceProducer.save(self))
-        elif self.research_facility:
-            saved_building.update(ResearchFacility.save(self))
+        for role in self.roles:
+            saved_building.update(role.save(self))
         if self.garrisoned_soldiers:
             saved_building.update(self.save_garrison())
         return saved_building
@@ -639,12 +695,8 @@ class Building(PlayerEntity, UnitsProducer, ResourceProducer, ResearchFacility):
 
     def after_respawn(self, loaded_data: Dict):
         super().after_respawn(loaded_data)
-        if self.produced_units is not None:
-            UnitsProducer.after_respawn(self, loaded_data)
-        if self.produced_resource is not None:
-            ResourceProducer.after_respawn(self, loaded_data)
-        if self.research_facility:
-            ResearchFacility.after_respawn(self, loaded_data)
+        for role in self.roles:
+            role.after_respawn(self, loaded_data)
         if self.garrisoned_soldiers:
             self.load_garrison()
 
@@ -2,17 +2,20 @@
 
 from abc import abstractmethod
 from functools import partial
-from typing import Tuple, Dict
+from typing import Tuple, Dict, FrozenSet, Union
 
 from utils.data_types import TechnologyId
 from utils.game_logging import log_here
 
 
 class Technology:
+    __slots__ = ('id', 'name', 'description', 'required', 'unlock', 'difficulty', 'funding_cost',
+                 'function_on_researched')
+
     def __init__(self,
                  id: TechnologyId,
                  name: str,
-                 required: Tuple[TechnologyId] = (),
+                 required: Union[Tuple[TechnologyId], TechnologyId] = (),
                  unlock: Tuple[TechnologyId] = (),
                  difficulty: float = 100.0,
                  funding_cost: float = 0,
@@ -20,14 +23,17 @@ class Technology:
         self.id = id
         self.name = name
         self.description = None
-        self.required = required
+        if not isinstance(required, (tuple, list)):  # technologies.csv uses a single id, or 0 if none is required
+            required = (required, ) if required else ()
+        # frozenset allows checking if researcher knows all required technologies with a single subset test:
+        self.required: FrozenSet[TechnologyId] = frozenset(required)
         self.unlock = unlock
         self.difficulty = difficulty
         self.funding_cost = 0
         self.function_on_researched = effect
 
     def unlocked(self, researcher) -> bool:
-        return all(tech_id in researcher.known_technologies for tech_id in self.required)
+        return self.required <= researcher.known_technologies
 
     @abstractmethod
     def gain_technology_effects(self, researcher):
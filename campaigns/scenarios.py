@@ -2,19 +2,24 @@
 from __future__ import annotations
 
 import os
+import pickle
 import shelve
 
 from campaigns.triggers import EventTrigger
 from utils.colors import CLEAR_GREEN, RED
 
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Iterable, Optional
 from collections import namedtuple, defaultdict
 
+from utils.constants import VICTORY_POINTS_CHANGED
+from utils.game_logging import log_here
 from utils.functions import find_paths_to_all_files_of_type
 from utils.scheduling import ScheduledEvent
 from campaigns.research import Technology
 from players_and_factions.player import Player
 
+CAMPAIGNS_CACHE = 'campaigns.pkl'
+
 ScenarioDescriptor = namedtuple('ScenarioDescriptor',
                                 ['name',
                                  'finished',
@@ -26,7 +31,10 @@ ScenarioDescriptor = namedtuple('ScenarioDescriptor',
 
 class Scenario:
     """
-    Scenario keeps track of TriggeredEvents checking if any of them should be executed.
+    Scenario keeps track of TriggeredEvents checking if any of them should be executed. EventTriggers depending on
+    scenario events are evaluated only when these events are published with on_game_event(), the rest of them is
+    checked once per second. Each newly added or loaded EventTrigger is checked once by the next poll as well, since its
+    condition could be fulfilled before any event it depends on happens.
     """
     game = None
 
@@ -44,7 +52,11 @@ class Scenario:
         self.victory_points: Dict[int, int] = defaultdict(int)
         self.required_victory_points: Dict[int, int] = defaultdict(int)
 
-        self.events_triggers: List[EventTrigger] = []
+        # EventTriggers are kept in dicts by their id(), which makes removing them O(1):
+        self.events_triggers: Dict[int, EventTrigger] = {}
+        self.polled_triggers: Dict[int, EventTrigger] = {}
+        self.triggers_by_event: Dict[str, Dict[int, EventTrigger]] = defaultdict(dict)
+        self.unchecked_triggers: Dict[int, EventTrigger] = {}
 
         self.ended = False
         self.winner = None
@@ -85,10 +97,18 @@ class Scenario:
 
     def add_events_triggers(self, *events_triggers: EventTrigger) -> Scenario:
         for trigger in events_triggers:
-            self.events_triggers.append(trigger)
+            self.events_triggers[id(trigger)] = trigger
+            self.unchecked_triggers[id(trigger)] = trigger
+            self.subscribe_event_trigger(trigger)
             trigger.bind_game_and_scenario(self)
         return self
 
+    def subscribe_event_trigger(self, trigger: EventTrigger):
+        if not trigger.depends_on:
+            self.polled_triggers[id(trigger)] = trigger
+        for event_name in trigger.depends_on:
+            self.triggers_by_event[event_name][id(trigger)] = trigger
+
     def add_players(self, *players: Player) -> Scenario:
         for player in players:
             self.players.add(player.id)
@@ -96,7 +116,12 @@ class Scenario:
         return self
 
     def remove_event_trigger(self, event_trigger: EventTrigger) -> Scenario:
-        self.events_triggers.remove(event_trigger)
+        trigger_id = id(event_trigger)
+        self.events_triggers.pop(trigger_id, None)
+        self.polled_triggers.pop(trigger_id, None)
+        self.unchecked_triggers.pop(trigger_id, None)
+        for event_name in event_trigger.depends_on:
+            self.triggers_by_event[event_name].pop(trigger_id, None)
         return self
 
     def eliminate_player(self, player: Player):
@@ -106,8 +131,8 @@ class Scenario:
         self.check_for_last_survivor()
 
     def remove_event_triggers_for_player(self, player):
-        for trigger in [t for t in self.events_triggers if t.player == player]:
-            self.events_triggers.remove(trigger)
+        for trigger in [t for t in self.events_triggers.values() if t.player == player]:
+            self.remove_event_trigger(trigger)
 
     def check_for_last_survivor(self):
         if len(self.players) == 1:
@@ -118,12 +143,41 @@ class Scenario:
         ...
 
     def evaluate_events_triggers(self):
-        for event_trigger in (t for t in self.events_triggers if t.active):
-            event_trigger.evaluate_condition()
+        """
+        Called each second to check these EventTriggers, which do not depend on any scenario event, and these which
+        were not checked since they were added.
+        """
+        if self.unchecked_triggers:
+            unchecked = self.unchecked_triggers
+            self.unchecked_triggers = {}
+            self.execute_fulfilled_triggers(
+                self.find_fulfilled_triggers(t for t in unchecked.values() if id(t) not in self.polled_triggers)
+            )
+        if self.polled_triggers:
+            self.execute_fulfilled_triggers(self.find_fulfilled_triggers(self.polled_triggers.values()))
+
+    def on_game_event(self, event_name: str):
+        if triggers := self.triggers_by_event.get(event_name):
+            self.execute_fulfilled_triggers(self.find_fulfilled_triggers(triggers.values()))
+
+    @staticmethod
+    def find_fulfilled_triggers(triggers: Iterable[EventTrigger]) -> List[EventTrigger]:
+        return [t for t in triggers if t.active and t.condition_fulfilled()]
+
+    def execute_fulfilled_triggers(self, fulfilled: List[EventTrigger]):
+        """
+        Fulfilled EventTriggers are removed before their Events are executed, so Events can safely remove other
+        EventTriggers.
+        """
+        for event_trigger in fulfilled:
+            self.remove_event_trigger(event_trigger)
+        for event_trigger in fulfilled:
+            event_trigger.execute_events()
 
     def add_victory_points(self, player: Player, points: int):
         self.victory_points[player.id] += points
         self.check_victory_points(player.id)
+        self.on_game_event(VICTORY_POINTS_CHANGED)
 
     def check_victory_points(self, player_id: int):
         points = self.victory_points[player_id]
@@ -148,12 +202,16 @@ class Scenario:
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        for event_trigger in self.events_triggers:
-            event_trigger.bind_game_and_scenario(self)
+        # ids of unpickled EventTriggers are different, so all dicts must be rebuilt:
+        self.events_triggers, self.polled_triggers, self.triggers_by_event = {}, {}, defaultdict(dict)
+        self.unchecked_triggers = {}
+        self.add_events_triggers(*state['events_triggers'])
 
     def __getstate__(self):
         state = self.__dict__.copy()
         state['allowed_technologies'] = {}
+        state['events_triggers'] = list(self.events_triggers.values())
+        del state['polled_triggers'], state['triggers_by_event'], state['unchecked_triggers']
         return state
 
 
@@ -166,22 +224,43 @@ class Campaign:
             # why 'not i'? first Mission of a Campaign is always playable!
             i: [name, not i] for i, name in enumerate(missions_names)
         }
+        self.finished_missions: Set[int] = set()
+        self._playable: List[str] = self.find_playable_missions()
+
+    def find_playable_missions(self) -> List[str]:
+        return [name for (name, status) in self.missions.values() if status]
 
     @property
     def playable_missions(self) -> List[str]:
-        return [name for (name, status) in self.missions.values() if status]
+        return self._playable
 
     @property
     def progress(self) -> int:
-        if self.playable_missions[1:]:
-            return 100 * (len(self.missions) // len(self.playable_missions))
-        return 0
+        if not self.missions:
+            return 0
+        return 100 * len(self.finished_missions) // len(self.missions)
 
     def update(self, finished_scenario: Scenario):
+        self.finished_missions.add(finished_scenario.index)
         try:  # unblock next mission of campaign:
-            self.missions[finished_scenario.index + 1][1] = True
+            next_mission = self.missions[finished_scenario.index + 1]
         except (KeyError, IndexError):
-            pass
+            return
+        if not next_mission[1]:
+            next_mission[1] = True
+            self._playable.append(next_mission[0])
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'finished_missions' not in state:
+            # older Campaign files: each unlocked Mission, except the first one, was unlocked by finishing the previous:
+            self.finished_missions = {i - 1 for i, (_, status) in self.missions.items() if i and status}
+        self._playable = self.find_playable_missions()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_playable']
+        return state
 
     def save_campaign(self,):
         scenarios_path = os.path.abspath('scenarios')
@@ -191,8 +270,48 @@ class Campaign:
 
 
 def load_campaigns() -> Dict[str, Campaign]:
-    campaigns: Dict[str, Campaign] = {}
+    """
+    Load all Campaigns from the single pickled cache file, which is rebuilt
+    from the .cmpgn files only when any of them was modified after the cache.
+    """
     names = find_paths_to_all_files_of_type('cmpgn', 'scenarios')
+    campaigns_names = {name.replace('.cmpgn', '') for name in names}
+    cache_path = os.path.join(os.path.abspath('scenarios'), CAMPAIGNS_CACHE)
+    newest = max((os.path.getmtime(os.path.join(path, name)) for name, path in names.items()), default=0)
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= newest:
+        if (campaigns := load_campaigns_cache(cache_path)) is not None and campaigns.keys() == campaigns_names:
+            return campaigns
+    campaigns = load_campaigns_files(names)
+    save_campaigns_cache(cache_path, campaigns)
+    return campaigns
+
+
+def load_campaigns_cache(cache_path: str) -> Optional[Dict[str, Campaign]]:
+    # broken cache, or pickled before any of the Campaign classes changed, is just rebuilt from the .cmpgn files:
+    try:
+        with open(cache_path, 'rb') as cache:
+            return pickle.load(cache)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError) as error:
+        log_here(f'Could not read campaigns cache: {error}', console=True)
+
+
+def save_campaigns_cache(cache_path: str, campaigns: Dict[str, Campaign]):
+    # cache is written to a temporary file first, so it is never left half-written:
+    temporary_path = f'{cache_path}.tmp'
+    try:
+        with open(temporary_path, 'wb') as cache:
+            pickle.dump(campaigns, cache)
+        os.replace(temporary_path, cache_path)
+    except (OSError, pickle.PicklingError, AttributeError, TypeError) as error:
+        log_here(f'Could not write campaigns cache: {error}', console=True)
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def load_campaigns_files(names: Dict[str, str]) -> Dict[str, Campaign]:
+    campaigns: Dict[str, Campaign] = {}
     for name, path in names.items():
         with shelve.open(os.path.join(path, name), 'r') as campaign_file:
             campaign_name = name.replace('.cmpgn', '')
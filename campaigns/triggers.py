@@ -2,16 +2,22 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from campaigns.events import Event
+from utils.constants import (
+    UNITS_CHANGED, BUILDINGS_CHANGED, TECHNOLOGY_RESEARCHED, UNITS_SELECTED, BUILDING_SELECTED, VICTORY_POINTS_CHANGED
+)
 from players_and_factions.player import Player, Faction
 
 
 class EventTrigger:
     """
-    EventTrigger is checked regularly in the Scenario update() to evaluate if Events attached to it should be executed.
+    EventTrigger is checked by the Scenario to evaluate if Events attached to it should be executed. Triggers which
+    declare scenario events they depend on, are evaluated only when one of these events happens, the rest is checked
+    regularly.
     """
+    depends_on: Tuple[str, ...] = ()
 
     def __init__(self, player: Player):
         self.player = player
@@ -41,8 +47,11 @@ class EventTrigger:
 
     def evaluate_condition(self):
         if self.condition_fulfilled():
-            for event in self.events:
-                event.execute()
+            self.execute_events()
+
+    def execute_events(self):
+        for event in self.events:
+            event.execute()
 
     @abstractmethod
     def condition_fulfilled(self) -> bool:
@@ -61,6 +70,7 @@ class EventTrigger:
 
 class PlayerSelectedUnitsTrigger(EventTrigger):
     """This Trigger is useful for tutorials."""
+    depends_on = (UNITS_SELECTED,)
 
     def __init__(self, player: Player, units_to_select_name: Optional[str] = None):
         super().__init__(player)
@@ -73,6 +83,7 @@ class PlayerSelectedUnitsTrigger(EventTrigger):
 
 
 class PlayerSelectedBuildingTrigger(EventTrigger):
+    depends_on = (BUILDING_SELECTED,)
 
     def __init__(self, player: Player, building_to_select_name: str):
         super().__init__(player)
@@ -102,11 +113,12 @@ class TimePassedTrigger(EventTrigger):
 
 class MapRevealedTrigger(EventTrigger):
     def condition_fulfilled(self) -> bool:
-        return len(self.game.fog_of_war.unexplored) == 0
+        return not self.game.fog_of_war.unexplored_mask.any()
 
 
 class NoUnitsLeftTrigger(EventTrigger):
     """Beware that this Trigger checks bot against Units and Buildings!"""
+    depends_on = (UNITS_CHANGED, BUILDINGS_CHANGED)
 
     def __init__(self, player: Player = None, faction: Faction = None):
         """
@@ -133,6 +145,7 @@ class NoUnitsLeftTrigger(EventTrigger):
 
 
 class HasUnitsOfTypeTrigger(EventTrigger):
+    depends_on = (UNITS_CHANGED,)
 
     def __init__(self, player: Player, unit_type: str, amount=0):
         super().__init__(player)
@@ -144,6 +157,8 @@ class HasUnitsOfTypeTrigger(EventTrigger):
 
 
 class HasBuildingsOfTypeCondition(HasUnitsOfTypeTrigger):
+    depends_on = (BUILDINGS_CHANGED,)
+
     def __init__(self, player: Player, building_type, amount=0):
         super().__init__(player, building_type, amount)
 
@@ -152,6 +167,8 @@ class HasBuildingsOfTypeCondition(HasUnitsOfTypeTrigger):
 
 
 class ControlsBuildingTrigger(EventTrigger):
+    depends_on = (BUILDINGS_CHANGED,)
+
     def __init__(self, player: Player, building_id: int):
         super().__init__(player)
         self.building_id = building_id
@@ -167,6 +184,8 @@ class ControlsAreaTrigger(EventTrigger):
 
 
 class HasTechnologyTrigger(EventTrigger):
+    depends_on = (TECHNOLOGY_RESEARCHED,)
+
     def __init__(self, scenario, player: Player, technology_id: int):
         super().__init__(player)
         self.technology_id = technology_id
@@ -187,6 +206,7 @@ class HasResourceTrigger(EventTrigger):
 
 
 class VictoryPointsTrigger(EventTrigger):
+    depends_on = (VICTORY_POINTS_CHANGED,)
 
     def __init__(self, player: Player, required_vp: int):
         super().__init__(player)
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 
-from typing import Set, Optional
+import logging
+
+from functools import partial
+from typing import Callable, Dict, Set, Optional
 
 from arcade import Window
 from arcade.key import *
@@ -10,7 +13,7 @@ from user_interface.user_interface import (
     ToggledElement, TextInputField, UiBundlesHandler
 )
 from utils.functions import ignore_in_menu, ignore_in_game
-from utils.game_logging import log_here
+from utils.game_logging import log_here, file_logger
 
 KEYBOARD_SCROLL_SPEED = 50
 
@@ -22,11 +25,23 @@ class KeyboardHandler(ToggledElement):
         super().__init__()
         self.window = window
         self.keyboard_input_consumer: Optional[TextInputField] = None
+        # bitmask of the modifier keys (MOD_CTRL, MOD_SHIFT...) held during the last key press:
+        self.modifiers: int = 0
         text_input_consumer.set_keyboard_handler(handler=self)
-
-    def on_key_press(self, symbol: int):
-        log_here(f'Pressed key: {symbol}, other pressed keys: {self.keys_pressed}')
+        self.keys_handlers: Dict[int, Callable] = {
+            P: self.toggle_pause,
+            U: partial(self.show_construction_options, UI_UNITS_CONSTRUCTION_PANEL),
+            B: partial(self.show_construction_options, UI_BUILDINGS_CONSTRUCTION_PANEL),
+            ESCAPE: self.on_escape_pressed,
+            LCTRL: self.toggle_waypoint_mode,
+            DELETE: self.kill_selected_in_editor_mode,
+        }
+
+    def on_key_press(self, symbol: int, modifiers: int = 0):
+        if file_logger.isEnabledFor(logging.DEBUG):  # avoid formatting message for each key pressed
+            log_here(f'Pressed key: {symbol}, other pressed keys: {self.keys_pressed}')
         self.keys_pressed.add(symbol)
+        self.modifiers = modifiers
         self.evaluate_pressed_key(symbol)
         if self.keyboard_input_consumer is not None:
             self.send_key_to_input_consumer(symbol)
@@ -37,23 +52,25 @@ class KeyboardHandler(ToggledElement):
         self.keys_pressed.discard(symbol)
 
     def evaluate_pressed_key(self, symbol: int):
-        if symbol == P and self.window.is_game_running:
-            self.window.game.toggle_pause()
-        elif symbol == U and self.window.is_game_running:
-            self.window.game.show_construction_options(UI_UNITS_CONSTRUCTION_PANEL)
-        elif symbol == B and self.window.is_game_running:
-            self.window.game.show_construction_options(UI_BUILDINGS_CONSTRUCTION_PANEL)
-        elif symbol == D:
-            ...
-        elif symbol == ESCAPE:
-            self.on_escape_pressed()
-        elif symbol == LCTRL:
-            self.window.game.units_manager.toggle_waypoint_mode()
-        elif symbol == DELETE:
-            if self.window.settings.editor_mode and self.window.game.units_manager.units_or_building_selected:
-                self.window.game.units_manager.kill_selected()
-        elif (digit := chr(symbol)).isdigit():
-            self.on_numeric_key_press(int(digit))
+        if (handler := self.keys_handlers.get(symbol)) is not None:
+            handler()
+        elif KEY_0 <= symbol <= KEY_9:
+            self.on_numeric_key_press(symbol - KEY_0)
+
+    @ignore_in_menu
+    def toggle_pause(self):
+        self.window.game.toggle_pause()
+
+    @ignore_in_menu
+    def show_construction_options(self, construction_panel: str):
+        self.window.game.show_construction_options(construction_panel)
+
+    def toggle_waypoint_mode(self):
+        self.window.game.units_manager.toggle_waypoint_mode()
+
+    def kill_selected_in_editor_mode(self):
+        if self.window.settings.editor_mode and self.window.game.units_manager.units_or_building_selected:
+            self.window.game.units_manager.kill_selected()
 
     def on_escape_pressed(self):
         game = self.window.game_view
@@ -68,7 +85,7 @@ class KeyboardHandler(ToggledElement):
 
     def on_numeric_key_press(self, digit: int):
         manager = self.window.mouse.units_manager
-        if LCTRL in self.keys_pressed:
+        if self.modifiers & MOD_CTRL:
             manager.create_new_permanent_units_group(digit)
         else:
             manager.select_permanent_units_group(digit)
@@ -91,7 +108,7 @@ class KeyboardHandler(ToggledElement):
 
     @ignore_in_game
     def send_key_to_input_consumer(self, symbol: int):
-        self.keyboard_input_consumer.receive(symbol, LSHIFT in self.keys_pressed)
+        self.keyboard_input_consumer.receive(symbol, bool(self.modifiers & MOD_SHIFT))
 
     def bind_keyboard_input_consumer(self, consumer: TextInputField):
         self.keyboard_input_consumer = consumer
@@ -71,6 +71,8 @@ class MouseCursor(AnimatedTimeBasedSprite, ToggledElement, EventsCreator):
 
         # cache currently updated and drawn spritelists of the active View:
         self._updated_spritelists: List[DrawnAndUpdated] = []
+        # spritelists which could be pointed by the cursor, each paired with the flag if it is UiSpriteList:
+        self.pointable_spritelists: List[Tuple[SpriteList, bool]] = []
 
         self.mouse_dragging = False
 
@@ -152,6 +154,11 @@ class MouseCursor(AnimatedTimeBasedSprite, ToggledElement, EventsCreator):
         self._updated_spritelists = [
             v for v in value if isinstance(v, (SpriteList, LayeredSpriteList))
         ]
+        # types are checked here once, instead of each time the cursor looks for the pointed sprite:
+        self.pointable_spritelists = [
+            (s, isinstance(s, UiSpriteList)) for s in self._updated_spritelists
+            if isinstance(s, (LayeredSpriteList, UiSpriteList))
+        ]
 
     def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
         self.position = x, y
@@ -340,18 +347,16 @@ class MouseCursor(AnimatedTimeBasedSprite, ToggledElement, EventsCreator):
         # cursor-pointed elements in backward order: last draw, is first to
         # be mouse-pointed (it lies on the top)
         if (pointed_sprite := self.dragged_ui_element) is None:
-            for drawn in reversed(self._updated_spritelists):
-                if not isinstance(drawn, (LayeredSpriteList, UiSpriteList)):
-                    continue
-                if pointed_sprite := self.cursor_points(drawn, x, y):
+            for drawn, is_ui_spritelist in reversed(self.pointable_spritelists):
+                if pointed_sprite := self.cursor_points(drawn, x, y, is_ui_spritelist):
                     break
             else:
                 return
         return pointed_sprite
 
-    def cursor_points(self, spritelist: SpriteList, x, y) -> Optional[Sprite]:
+    def cursor_points(self, spritelist: SpriteList, x, y, is_ui_spritelist: bool) -> Optional[Sprite]:
         if pointed := get_sprites_at_point((x, y), spritelist):
-            if not isinstance(spritelist, UiSpriteList):
+            if not is_ui_spritelist:
                 return pointed[0]
             s: UiElement
             try:
@@ -406,7 +411,7 @@ class MouseCursor(AnimatedTimeBasedSprite, ToggledElement, EventsCreator):
 
     def cursor_on_terrain_with_selected_units(self):
         grid = position_to_map_grid(*self.position)
-        if self.game.map.walkable(grid) or grid in self.game.fog_of_war.unexplored:
+        if self.game.map.walkable(grid) or self.game.fog_of_war.is_unexplored(grid):
             self.set_texture(CURSOR_MOVE_TEXTURE)
         else:
             self.set_texture(CURSOR_FORBIDDEN_TEXTURE)
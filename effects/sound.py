@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from math import dist
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from collections import defaultdict, deque
 
 from utils.game_logging import log_here
 
-from arcade import load_sound, play_sound, stop_sound, Sound
-from pyglet.media import Player
+from arcade import load_sound, Sound
+from pyglet.media import Player, StaticSource
 
 
 SOUNDS_DIRECTORY = 'resources/sounds'
@@ -18,6 +20,8 @@ MUSIC_TRACK_SUFFIX = 'theme'
 UNITS_MOVE_ORDERS_CONFIRMATIONS = [f'on_unit_get_order_{i}.wav' for i in range(6)]
 UNITS_SELECTION_CONFIRMATIONS = [f'on_unit_selected_{i}.wav' for i in range(6)]
 UNIT_PRODUCTION_FINISHED = [f'unit_{suffix}.wav' for suffix in ("ready", "complete")]
+SOUND_PLAYERS_POOL_SIZE = 32
+SOUND_COMMANDS_QUEUE_SIZE = 256
 
 
 class SoundPlayer:
@@ -44,7 +48,11 @@ class SoundPlayer:
         self._effects_volume: float = window.settings.effects_volume
 
         self.sounds: Dict[str, Sound] = self._preload_sounds()
-        self.currently_played: List[Player] = []
+        self.free_players: Deque[Player] = deque(self._create_players_pool())
+        self.currently_played: Set[Player] = set()
+        self.music_player = Player()
+        # sound effects requested by the game logic are played all at once, in the SoundPlayer update:
+        self.sound_commands: Deque[Tuple[str, Optional[float]]] = deque(maxlen=SOUND_COMMANDS_QUEUE_SIZE)
         self.current_music: Optional[Player] = None
 
         self.paused_track_name: Optional[str] = None
@@ -63,10 +71,35 @@ class SoundPlayer:
 
     def _preload_sounds(self) -> Dict[str, Sound]:
         names_to_paths = self.window.resources_manager.get(SOUNDS_EXTENSION)
-        return {
-            name: load_sound(path, streaming=False) for
-            name, path in names_to_paths.items()
-        }
+        # decoding is done mostly in C, outside the GIL, so sounds are loaded in parallel:
+        with ThreadPoolExecutor() as executor:
+            sounds = executor.map(self._load_static_sound, names_to_paths.values())
+            return dict(zip(names_to_paths.keys(), sounds))
+
+    @staticmethod
+    def _load_static_sound(path) -> Sound:
+        """
+        Sounds are decoded only once, when loaded, and each Player queuing the
+        StaticSource replays the PCM data kept in memory.
+        """
+        sound = load_sound(path, streaming=False)
+        if not isinstance(sound.source, StaticSource):
+            sound.source = StaticSource(sound.source)
+        return sound
+
+    def _create_players_pool(self) -> List[Player]:
+        """
+        Players are created once and reused, each returns to the pool when
+        it runs out of the queued sound.
+        """
+        players = [Player() for _ in range(SOUND_PLAYERS_POOL_SIZE)]
+        for player in players:
+            player.push_handlers(on_player_eos=partial(self._release_player, player))
+        return players
+
+    def _release_player(self, player: Player):
+        self.currently_played.discard(player)
+        self.free_players.append(player)
 
     def _setup_playlists(self) -> Dict[str, List[str]]:
         playlists = defaultdict(list)
@@ -156,6 +189,14 @@ class SoundPlayer:
             if (playlist := self.current_playlist) is not None:
                 self._next_playlist_index()
                 self.play_music(playlist[self.playlist_index], False)
+        if self.sound_commands:
+            self._play_queued_sounds()
+
+    def _play_queued_sounds(self):
+        commands = self.sound_commands
+        while commands:
+            name, volume = commands.popleft()
+            self._play_sound(name, loop=False, volume=volume)
 
     def _next_playlist_index(self):
         if self.playlist_index == len(self.current_playlist) - 1:
@@ -183,7 +224,7 @@ class SoundPlayer:
         if volume is None and sound_position is not None and self.max_sound_distance is not None:
             volume = self.calculate_volume_based_on_distance(sound_position)
 
-        self._play_sound(name, loop=False, volume=volume)
+        self.sound_commands.append((name, volume))
 
     def calculate_volume_based_on_distance(self, sound_position: Tuple[float, float]) -> float:
         """
@@ -206,26 +247,26 @@ class SoundPlayer:
         self.play_sound(random.choice(sounds_list), volume or self.effects_volume)
 
     def _stop_music_track(self):
-        try:
-            stop_sound(self.current_music)
-        except (AttributeError, ValueError):
-            pass
-        finally:
+        if self.current_music is not None:
+            self.current_music.next_source()  # pauses player and empties its queue
             self.current_music = None
 
     def _play_music_track(self, name, loop, volume):
         # volume = self.music_volume * volume if volume is not None else self.music_volume
-        player = self._get_player(name, loop, volume)
-        self.current_music = player
+        self.current_music = self._setup_player(self.music_player, name, loop, volume)
 
     def _play_sound(self, name, loop, volume):
         volume = self.effects_volume * volume if volume is not None else self.effects_volume
-        player = self._get_player(name, loop, volume)
-        self.currently_played.append(player)
-
-    def _get_player(self, name, loop, volume) -> Player:
-        volume = min(volume, self.sound_volume)
-        return play_sound(self.sounds[name], volume, looping=loop)
+        if self.free_players:  # when all Players are busy, the sound is skipped
+            player = self._setup_player(self.free_players.popleft(), name, loop, volume)
+            self.currently_played.add(player)
+
+    def _setup_player(self, player: Player, name, loop, volume) -> Player:
+        player.volume = min(volume, self.sound_volume)
+        player.loop = loop
+        player.queue(self.sounds[name].source)
+        player.play()
+        return player
 
     def play(self):
         """Plays all the sounds."""
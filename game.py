@@ -319,7 +319,7 @@ class GameWindow(Window, EventsCreator):
 
     def on_key_press(self, symbol: int, modifiers: int):
         if self.keyboard.active:
-            self.keyboard.on_key_press(symbol)
+            self.keyboard.on_key_press(symbol, modifiers)
 
     def on_key_release(self, symbol: int, modifiers: int):
         self.keyboard.on_key_release(symbol)
@@ -1099,6 +1099,11 @@ class Game(LoadableWindowView, UiBundlesHandler, EventsCreator):
         for faction in self.factions.values():
             faction.update(delta_time)
 
+    def publish_scenario_event(self, event_name: str):
+        """Let current Scenario evaluate EventTriggers depending on this event."""
+        if self.current_scenario is not None:
+            self.current_scenario.on_game_event(event_name)
+
     @timer(level=1, global_profiling_level=PROFILING_LEVEL)
     def on_draw(self):
         super().on_draw()
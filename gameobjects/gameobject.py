@@ -1,52 +1,76 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import Optional, Union
 
-from PIL import Image
+import numpy as np
 
-from arcade import AnimatedTimeBasedSprite, load_texture, draw_rectangle_filled
+from arcade import AnimatedTimeBasedSprite, Texture, load_texture, draw_rectangle_filled
 from arcade.arcade_types import Point
 
 from utils.constants import TILE_WIDTH, TILE_HEIGHT
 from utils.colors import GREEN, RED, add_transparency
 from utils.geometry import ROTATIONS
 from utils.observer import Observed, Observer
-from utils.functions import get_path_to_file, add_extension
+from utils.functions import get_path_to_file, add_extension, get_texture_size
 from utils.game_logging import log_here
 from utils.improved_spritelists import LayeredSpriteList
 from utils.scheduling import EventsCreator, ScheduledEvent
 
 
+@lru_cache(maxsize=1024)
 def name_without_color(name: str) -> str:
     for color in ('_red', '_green', '_blue', '_yellow'):
         if name.endswith(color):
-            return name.replace(color, '')
+            return name[:-len(color)]
     return name
 
 
+@lru_cache(maxsize=None)
+def load_wreck_texture(name: str, texture_index: Union[tuple, int]) -> Texture:
+    """Each frame of the wrecks spritesheet is loaded only once, and then shared by all Wrecks."""
+    texture_name = get_path_to_file(name)
+    width, height = get_texture_size(name)
+    try:  # for tanks with turrets
+        i, j = texture_index  # Tuple
+        return load_texture(
+            texture_name, j * (width // ROTATIONS), i * (height // ROTATIONS), width // ROTATIONS, height // ROTATIONS)
+    except TypeError:
+        return load_texture(texture_name, texture_index * (width // ROTATIONS), 0, width // ROTATIONS, height)
+
+
 class GameObject(AnimatedTimeBasedSprite, EventsCreator, Observed):
     """
     GameObject represents all in-game objects, like units, buildings,
     terrain props, trees etc.
     """
+    # arcade Sprite has no __slots__, so instances still have __dict__, but these attributes are read faster from slots:
+    __slots__ = ('object_name', 'full_name', 'filename_with_path', 'id', 'is_updated', 'is_rendered',
+                 'layered_spritelist')
     game = None
     total_objects_count = 0
+    # subclasses which set their texture themselves, can skip loading the whole image file in the Sprite constructor:
+    load_texture_on_init = True
+    # texture name -> (object_name, full_name, filename_with_path), since these are the same for each spawned object:
+    names_cache: dict[str, tuple[str, str, str]] = {}
 
     def __init__(self, texture_name: str,
                  position: Point = (0, 0),
                  object_id: Optional[int] = None,
                  observers: Optional[list[Observer]] = None):
+        if (names := GameObject.names_cache.get(texture_name)) is None:
+            full_name = add_extension(texture_name)
+            names = GameObject.names_cache[texture_name] = (
+                name_without_color(texture_name), full_name, self.game.resources_manager.get(full_name)
+            )
         # raw name of the object without texture extension and Player color
-        # used to query game.configs and as a basename to build other names
-        self.object_name = name_without_color(texture_name)
-        # name with texture extension added used to find ant load texture
-        self.full_name = full_name = add_extension(texture_name)
-
-        self.filename_with_path = self.game.resources_manager.get(full_name)
+        # used to query game.configs and as a basename to build other names,
+        # name with texture extension added used to find ant load texture:
+        self.object_name, self.full_name, self.filename_with_path = names
 
-        super().__init__(self.filename_with_path, center_x=position[0], center_y=position[1])
+        filename = self.filename_with_path if self.load_texture_on_init else None
+        super().__init__(filename, center_x=position[0], center_y=position[1])
         Observed.__init__(self, observers)
         EventsCreator.__init__(self)
 
@@ -79,29 +103,32 @@ class GameObject(AnimatedTimeBasedSprite, EventsCreator, Observed):
 
     @property
     def on_screen(self) -> bool:
+        # arcade computes left, right, top and bottom from the hit-box points, so it is cheaper to use position and size:
         l, r, b, t = self.game.viewport
-        return self.right > l and self.left < r and self.top > b and self.bottom < t
+        x, y = self._position
+        half_width, half_height = self._width * 0.5, self._height * 0.5
+        return x + half_width > l and x - half_width < r and y + half_height > b and y - half_height < t
 
     def on_update(self, delta_time: float = 1 / 60):
-        self.position = [
-            self._position[0] + self.change_x * delta_time,
-            self._position[1] + self.change_y * delta_time
-        ]
-        self.update_visibility()
+        if self.change_x or self.change_y:  # most of the GameObjects stand still most of the time
+            self.position = [
+                self._position[0] + self.change_x * delta_time,
+                self._position[1] + self.change_y * delta_time
+            ]
 
         if self.frames and self.is_rendered:
             self.update_animation(delta_time)
 
-    def update_visibility(self):
-        if self.should_be_rendered:
+    def update_visibility(self, on_screen: bool):
+        """Called by the LayeredSpriteList, which finds all its GameObjects being on the screen at once."""
+        if self.should_be_rendered(on_screen):
             if not self.is_rendered:
                 self.start_rendering()
         elif self.is_rendered:
             self.stop_rendering()
 
-    @property
-    def should_be_rendered(self) -> bool:
-        return self.on_screen
+    def should_be_rendered(self, on_screen: bool) -> bool:
+        return on_screen
 
     def start_rendering(self):
         # log(f'Start rendering {self}', True)
@@ -145,6 +172,7 @@ class GameObject(AnimatedTimeBasedSprite, EventsCreator, Observed):
 
 
 class TerrainObject(GameObject):
+    __slots__ = ('map_node',)
 
     def __init__(self, filename: str, durability: int, position: Point):
         GameObject.__init__(self, filename, position)
@@ -179,6 +207,8 @@ class Tree(TerrainObject):
 
 
 class Wreck(TerrainObject):
+    # Wreck uses only a single frame of the spritesheet, so the whole sheet is never loaded for it:
+    load_texture_on_init = False
 
     def __init__(self, filename: str, durability: int, position: Point, texture_index: Union[tuple, int]):
         super().__init__(filename, durability, position)
@@ -190,15 +220,7 @@ class Wreck(TerrainObject):
         return f'Wreck(id: {self.id})'
 
     def set_proper_wreck_texture(self, name, texture_index):
-        texture_name = get_path_to_file(name)
-        width, height = Image.open(texture_name).size
-        try:  # for tanks with turrets
-            i, j = texture_index  # Tuple
-            self.texture = load_texture(
-                texture_name, j * (width // ROTATIONS), i * (height // ROTATIONS), width // ROTATIONS, height // ROTATIONS)
-        except TypeError:
-            self.texture = load_texture(
-                texture_name, texture_index * (width // ROTATIONS), 0, width // ROTATIONS, height)
+        self.texture = load_wreck_texture(name, texture_index)
 
 
 class Corpse(Wreck):
@@ -225,7 +247,7 @@ class PlaceableGameObject:
         self.last_grid = None
         self.grids = None
         self.drawn_gizmo_data = None
-        self.find_node = self.game.map.node
+        self.walkable_grid = self.game.map.walkable_grid
 
     def snap_to_the_map_grid(self, gx: int, gy: int, forced=False):
         """
@@ -238,12 +260,25 @@ class PlaceableGameObject:
         from utils.geometry import find_grid_center
         centered = find_grid_center((gx, gy), (self.grid_width, self.grid_height))
         self.position = map_grid_to_position(centered)
+        available = self.find_walkable_grids(gx, gy)
+        explored = None if self.game.editor_mode else self.game.fog_of_war.explored_mask
+        # walkable grids are always inside the Map, so they can index the explored-mask:
         self.grids = {
-            map_grid_to_position((gx + x, gy + y)): self.find_node((gx + x, gy + y)).available_for_construction
-            for y in range(self.grid_height) for x in range(self.grid_width)
+            map_grid_to_position(grid := (gx + x, gy + y)): bool(walkable and (explored is None or explored[grid]))
+            for (x, y), walkable in np.ndenumerate(available)
         }
         self.last_grid = gx, gy
 
+    def find_walkable_grids(self, gx: int, gy: int) -> np.ndarray:
+        """Slice the Building area from the Map walkable-grid. Grids outside the Map are not walkable."""
+        available = np.zeros((self.grid_width, self.grid_height), dtype=bool)
+        columns, rows = self.walkable_grid.shape
+        x0, y0 = max(gx, 0), max(gy, 0)
+        x1, y1 = min(gx + self.grid_width, columns), min(gy + self.grid_height, rows)
+        if x0 < x1 and y0 < y1:
+            available[x0 - gx:x1 - gx, y0 - gy:y1 - gy] = self.walkable_grid[x0:x1, y0:y1]
+        return available
+
     def update(self):
         if not self.grids:
             return
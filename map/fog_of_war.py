@@ -1,15 +1,18 @@
 #!/usr/bin/env python
 
-from functools import lru_cache
-from typing import Dict, KeysView, Optional, Set, Tuple
+from collections import defaultdict
+from typing import Dict, Iterable, KeysView, List, Optional, Set, Tuple
 
-from arcade import Sprite, SpriteList, make_soft_circle_texture
+import numpy as np
+
+from arcade import Sprite, make_soft_circle_texture
 
 from utils.colors import BLACK, FOG
 from utils.data_types import GridPosition
 from game import Game
 from utils.constants import TILE_WIDTH, TILE_HEIGHT
 from map.quadtree import Rect
+from utils.improved_spritelists import SpriteListWithBatchRemoval
 
 OFFSET_X = TILE_WIDTH // 2
 OFFSET_Y = TILE_HEIGHT // 2
@@ -42,101 +45,249 @@ class FogOfWar(Rect):
 
         # grid-data of the game-map:
         self.map_grids: KeysView[GridPosition] = self.game.map.nodes.keys()
+        self.columns, self.rows = columns, rows = self.game.map.columns, self.game.map.rows
+        # All sets of tiles are kept as boolean masks indexed by [x, y], so they
+        # are intersected and subtracted at once instead of tile by tile.
         # Tiles which have not been revealed yet:
-        self.unexplored: Set[GridPosition] = set([k for k in self.map_grids])
+        self.unexplored_mask = np.ones((columns, rows), dtype=bool)
 
         # Tiles revealed in this frame:
-        self.visible: Set[GridPosition] = set()
+        self.visible_mask = np.zeros((columns, rows), dtype=bool)
         # All tiles revealed to this moment:
-        self.explored: Set[GridPosition] = set()
+        self.explored_mask = np.zeros((columns, rows), dtype=bool)
+        # Number of stationary entities (Buildings) observing each tile, tiles
+        # with any observer are revealed in each frame:
+        self.static_observers = np.zeros((columns, rows), dtype=np.int32)
+        self.static_visible_mask = np.zeros((columns, rows), dtype=bool)
 
-        # Dict to find and manipulate Sprites in the spritelist:
-        self.grids_to_sprites: Dict[GridPosition, FogSprite] = {}
+        # Array to find and manipulate Sprites in the spritelists:
+        self.grids_to_sprites = np.empty((columns, rows), dtype=object)
+        # Tiles covered by a FogSprite:
+        self.sprite_present_mask = np.zeros((columns, rows), dtype=bool)
+        # Area of the map visible in the previous frame, first update checks the whole map:
+        self.previous_window: Optional[Tuple[int, int, int, int]] = (0, columns, 0, rows)
         # Black or semi-transparent grey sprites are drawn_area on the screen
         # width normal SpriteLists. We divide map for smaller areas with
-        # distinct spritelists to avoid updating too large sets each frame:
+        # distinct spritelists to avoid updating too large sets each frame.
+        # SpriteList of each tile is found once, and then indexed by [x, y]:
+        self.tiles_sprite_lists = np.empty((columns, rows), dtype=object)
+        # positions of FogSprites of each tile indexed by [x, y]:
+        self.tiles_positions = self.calculate_tiles_positions()
         self.fog_sprite_lists = self.create_dark_sprites() if self.game.settings.fog_of_war else {}
+        # world-space (left, right, bottom, top) of the area covered by each of the SpriteLists, and the SpriteLists
+        # in the same order, to find all SpriteLists overlapping the viewport with a single array-test:
+        self.sprite_lists_bounds = self.calculate_sprite_lists_bounds()
+        self.bounded_sprite_lists = list(self.fog_sprite_lists.values())
 
     def in_bounds(self, item) -> bool:
         return self.left <= item[0] <= self.right and self.bottom <= item[1] <= self.top
 
-    def create_dark_sprites(self, forced: bool = False) -> Dict[Tuple[int, int], SpriteList]:
+    def is_explored(self, grid: GridPosition) -> bool:
+        x, y = grid
+        return 0 <= x < self.columns and 0 <= y < self.rows and bool(self.explored_mask[x, y])
+
+    def is_unexplored(self, grid: GridPosition) -> bool:
+        x, y = grid
+        return 0 <= x < self.columns and 0 <= y < self.rows and bool(self.unexplored_mask[x, y])
+
+    @staticmethod
+    def mask_to_grids(mask: np.ndarray) -> Set[GridPosition]:
+        xs, ys = np.nonzero(mask)
+        return set(zip(xs.tolist(), ys.tolist()))
+
+    def calculate_tiles_positions(self) -> np.ndarray:
+        xs = np.arange(self.columns) * TILE_WIDTH + OFFSET_X
+        ys = np.arange(self.rows) * TILE_HEIGHT + OFFSET_Y
+        return np.stack(np.meshgrid(xs, ys, indexing='ij'), axis=-1)
+
+    def calculate_sprite_lists_bounds(self) -> np.ndarray:
+        width, height = FOG_SPRITELIST_SIZE * TILE_WIDTH, FOG_SPRITELIST_SIZE * TILE_HEIGHT
+        # FogSprite textures are larger than a tile, so they stick out of their tiles by half of the difference:
+        pad_x = (max(DARK_TEXTURE.width, FOG_TEXTURE.width) - TILE_WIDTH) / 2
+        pad_y = (max(DARK_TEXTURE.height, FOG_TEXTURE.height) - TILE_HEIGHT) / 2
+        return np.array([
+            ((col * width) - pad_x, (col + 1) * width + pad_x, (row * height) - pad_y, (row + 1) * height + pad_y)
+            for col, row in self.fog_sprite_lists
+        ], dtype=np.float32).reshape(-1, 4)
+
+    def create_dark_sprites(self, forced: bool = False) -> Dict[Tuple[int, int], SpriteListWithBatchRemoval]:
         """
         Fill whole map with black tiles representing unexplored, hidden area.
         """
         cols, rows = self.game.map.columns // FOG_SPRITELIST_SIZE, self.game.map.rows // FOG_SPRITELIST_SIZE
         sprite_lists = {}
+        tiles_sprite_lists = self.tiles_sprite_lists
         for col in range(cols+1):
             for row in range(rows+1):
-                sprite_lists[(col, row)] = SpriteList(is_static=True)
+                sprite_lists[(col, row)] = sprite_list = SpriteListWithBatchRemoval(is_static=True)
+                tiles = (slice(col * FOG_SPRITELIST_SIZE, (col + 1) * FOG_SPRITELIST_SIZE),
+                         slice(row * FOG_SPRITELIST_SIZE, (row + 1) * FOG_SPRITELIST_SIZE))
+                tiles_sprite_lists[tiles].fill(sprite_list)
         if (not self.game.editor_mode) or forced:
-            get_tile_position = self.get_tile_position
-            for x, y in self.unexplored:
-                sprite_list = sprite_lists[(x // FOG_SPRITELIST_SIZE, y // FOG_SPRITELIST_SIZE)]
-                sprite = FogSprite(get_tile_position(x, y), DARK_TEXTURE)
-                self.grids_to_sprites[(x, y)] = sprite
-                sprite_list.append(sprite)
+            xs, ys = np.nonzero(self.unexplored_mask)
+            # order tiles by their SpriteLists, so each SpriteList is extended only once:
+            buckets = (xs // FOG_SPRITELIST_SIZE) * (rows + 1) + ys // FOG_SPRITELIST_SIZE
+            order = np.argsort(buckets, kind='stable')
+            xs, ys = xs[order], ys[order]
+            sprites = [FogSprite(position, DARK_TEXTURE) for position in self.tiles_positions[xs, ys].tolist()]
+            self.grids_to_sprites[xs, ys] = sprites
+            _, starts = np.unique(buckets[order], return_index=True)
+            for start, end in zip(starts.tolist(), [*starts[1:].tolist(), len(sprites)]):
+                tiles_sprite_lists[xs[start], ys[start]].extend(sprites[start:end])
+            self.sprite_present_mask |= self.unexplored_mask
         return sprite_lists
 
-    def reveal_nodes(self, revealed: Set[GridPosition]):
+    def grids_to_tiles(self, grids: Iterable[GridPosition]) -> np.ndarray:
+        """
+        Pack GridPositions into indices of the flattened masks: x * rows + y.
+        Entities pack their observed areas once, when these areas change.
+        """
+        grids = np.array(list(grids), dtype=np.int64).reshape(-1, 2)
+        return grids[:, 0] * self.rows + grids[:, 1]
+
+    def reveal_nodes(self, revealed: np.ndarray):
         """
         Call this method from each PlayerEntity, which is observing map,
-        sending as param a set of GridPositions seen by the entity.
+        sending as param the packed tiles seen by the entity (see grids_to_tiles).
+        """
+        self.visible_mask.flat[revealed] = True
+
+    def register_static_observer(self, observed: Iterable[GridPosition]):
+        """
+        Call this method once for each entity which never moves, instead of
+        calling reveal_nodes each frame.
         """
-        self.visible.update(revealed)
+        self.change_static_observers(observed, 1)
+
+    def unregister_static_observer(self, observed: Iterable[GridPosition]):
+        self.change_static_observers(observed, -1)
+
+    def change_static_observers(self, observed: Iterable[GridPosition], change: int):
+        np.add.at(self.static_observers.reshape(-1), self.grids_to_tiles(observed), change)
+        np.greater(self.static_observers, 0, out=self.static_visible_mask)
 
     def update(self):
         if not self.game.settings.fog_of_war:
-            self.game.mini_map.visible = self.unexplored.union(self.explored)
+            self.game.mini_map.visible = set(self.map_grids)
+            return
+        self.visible_mask |= self.static_visible_mask
+        if (window := self.find_update_window()) is None:
+            self.game.mini_map.visible = set()
             return
-        # remove currently visible tiles from the fog-of-war:
-        visible = self.visible
-        grids_to_sprites = self.grids_to_sprites
+        revealed, fogged = self.find_fog_changes(window)
         # since MiniMap also draws FoW, but the miniaturized version of, send
         # set of GridPositions revealed this frame to the MiniMap instance:
-        self.game.mini_map.visible = revealed = visible.intersection(grids_to_sprites)
+        self.game.mini_map.visible = set(revealed)
+        self.remove_fog_sprites(revealed)
+        self.add_fog_sprites(*fogged)
+
+    def find_fog_changes(self, window: Tuple[int, int, int, int]) -> Tuple[List[GridPosition], Tuple[np.ndarray, ...]]:
+        """
+        Update all the masks and return tiles, which FogSprites should be
+        removed, and tiles which should be covered with the grey fog. Only the
+        masks are used here, SpriteLists are changed later by update().
+        """
+        x0, x1, y0, y1 = window
+        # all masks are sliced to the changed area, slices are views, so they modify the original masks:
+        area = slice(x0, x1), slice(y0, y1)
+        visible, present = self.visible_mask[area], self.sprite_present_mask[area]
+        explored = self.explored_mask[area]
+        # currently visible tiles are removed from the fog-of-war:
+        revealed = visible & present
+        xs, ys = np.nonzero(revealed)
+        revealed_grids = list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+        # grey-semi-transparent fog is added to the tiles which are no longer seen: explored & ~(visible | present),
+        # all the masks are updated in place to avoid allocating temporary arrays:
+        fog = visible | present
+        np.logical_not(fog, out=fog)
+        fog &= explored
+        xs, ys = np.nonzero(fog)
+        np.logical_xor(present, revealed, out=present)  # revealed tiles are always present
+        present |= fog
+        explored |= visible
+        np.logical_not(explored, out=self.unexplored_mask[area])
+        visible.fill(False)
+        return revealed_grids, (xs + x0, ys + y0)
+
+    def remove_fog_sprites(self, revealed: List[GridPosition]):
+        grids_to_sprites, tiles_sprite_lists = self.grids_to_sprites, self.tiles_sprite_lists
+        # revealed sprites are removed from each SpriteList at once:
+        removed = defaultdict(list)
         for grid in revealed:
-            sprite_list = self.fog_sprite_lists[(grid[0] // FOG_SPRITELIST_SIZE, grid[1] // FOG_SPRITELIST_SIZE)]
-            sprite_list.remove(grids_to_sprites[grid])
-            del grids_to_sprites[grid]
-        # add grey-semi-transparent fog to the tiles which are no longer seen:
-        fog = self.explored - visible
-        get_tile_position = self.get_tile_position
-        for grid_x, grid_y in fog.difference(grids_to_sprites):
-            x, y = get_tile_position(grid_x, grid_y)
-            grids_to_sprites[(grid_x, grid_y)] = sprite = FogSprite((x, y), FOG_TEXTURE)
-            sprite_list = self.fog_sprite_lists[(grid_x // FOG_SPRITELIST_SIZE, grid_y // FOG_SPRITELIST_SIZE)]
-            sprite_list.append(sprite)
-        self.explored.update(visible)
-        self.unexplored.difference_update(visible)
-        self.visible.clear()
+            removed[tiles_sprite_lists[grid]].append(grids_to_sprites[grid])
+            grids_to_sprites[grid] = None
+        for sprite_list, sprites in removed.items():
+            sprite_list.remove_many(sprites)
 
-    @staticmethod
-    @lru_cache()
-    def get_tile_position(x, y):
-        return x * TILE_WIDTH + OFFSET_X, y * TILE_HEIGHT + OFFSET_Y
+    def add_fog_sprites(self, xs: np.ndarray, ys: np.ndarray):
+        grids_to_sprites, tiles_sprite_lists = self.grids_to_sprites, self.tiles_sprite_lists
+        positions = self.tiles_positions[xs, ys].tolist()
+        for grid_x, grid_y, position in zip(xs.tolist(), ys.tolist(), positions):
+            grids_to_sprites[grid_x, grid_y] = sprite = FogSprite(position, FOG_TEXTURE)
+            tiles_sprite_lists[grid_x, grid_y].append(sprite)
+
+    def find_update_window(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Fog changes only on the tiles visible in this or in the previous frame,
+        so update() checks only the rectangle bounding both of these areas
+        instead of the whole map.
+        """
+        visible = self.visible_mask
+        columns, rows = np.flatnonzero(visible.any(axis=1)), np.flatnonzero(visible.any(axis=0))
+        window = (columns[0], columns[-1] + 1, rows[0], rows[-1] + 1) if columns.size else None
+        previous, self.previous_window = self.previous_window, window
+        if window is None or previous is None:
+            return window or previous
+        (left, right, bottom, top), (p_left, p_right, p_bottom, p_top) = window, previous
+        return min(left, p_left), max(right, p_right), min(bottom, p_bottom), max(top, p_top)
 
     def draw(self):
         if self.game.editor_mode:
             return
         left, right, bottom, top = self.game.viewport
-        screen_width, screen_height = left - right, top - bottom
-
-        for grid, sprite_list in self.fog_sprite_lists.items():
-            s_left, s_right = grid[0] * screen_width, (grid[0] + 1) * screen_width
-            s_bottom, s_top = grid[1] * screen_height, (grid[1] + 1) * screen_height
-            if (left < s_right or right > s_left) and (bottom < s_top or top > s_bottom):
-                sprite_list.draw()
+        bounds = self.sprite_lists_bounds
+        on_screen = (bounds[:, 1] >= left) & (bounds[:, 0] <= right) & (bounds[:, 3] >= bottom) & (bounds[:, 2] <= top)
+        sprite_lists = self.bounded_sprite_lists
+        for i in np.flatnonzero(on_screen):
+            sprite_lists[i].draw()
 
     def __getstate__(self) -> Dict:
         saved_fow = self.__dict__.copy()
         del saved_fow['map_grids']
         del saved_fow['grids_to_sprites']
+        del saved_fow['sprite_present_mask']
+        del saved_fow['tiles_sprite_lists']
+        del saved_fow['tiles_positions']
+        del saved_fow['sprite_lists_bounds']
+        del saved_fow['bounded_sprite_lists']
         del saved_fow['fog_sprite_lists']
+        del saved_fow['static_observers']
+        del saved_fow['static_visible_mask']
+        # unexplored tiles are always the rest of the map, and visible tiles are cleared each frame, so only the
+        # explored tiles are saved, packed to a single bit per tile:
+        del saved_fow['unexplored_mask']
+        del saved_fow['visible_mask']
+        saved_fow['explored_mask'] = np.packbits(self.explored_mask).tobytes()
         return saved_fow
 
     def __setstate__(self, state):
         self.__dict__.update(state)
         self.map_grids = self.game.map.nodes.keys()
-        self.grids_to_sprites = {}
+        shape = self.columns, self.rows
+        explored = np.unpackbits(np.frombuffer(state['explored_mask'], dtype=np.uint8), count=self.columns * self.rows)
+        self.explored_mask = explored.reshape(shape).astype(bool)
+        self.unexplored_mask = ~self.explored_mask
+        self.visible_mask = np.zeros(shape, dtype=bool)
+        self.grids_to_sprites = np.empty(shape, dtype=object)
+        self.sprite_present_mask = np.zeros(shape, dtype=bool)
+        self.previous_window = 0, self.columns, 0, self.rows
+        self.tiles_sprite_lists = np.empty(shape, dtype=object)
+        self.tiles_positions = self.calculate_tiles_positions()
         self.fog_sprite_lists = self.create_dark_sprites()
+        self.sprite_lists_bounds = self.calculate_sprite_lists_bounds()
+        self.bounded_sprite_lists = list(self.fog_sprite_lists.values())
+        # Buildings are respawned before the FogOfWar is loaded:
+        self.static_observers = np.zeros(shape, dtype=np.int32)
+        self.static_visible_mask = np.zeros(shape, dtype=bool)
+        for building in (b for b in self.game.buildings if b.is_controlled_by_human_player):
+            self.register_static_observer(building.observed_grids)
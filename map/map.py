@@ -1,15 +1,20 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
-import math
+import heapq
 import random
 from enum import IntEnum
 
+import numpy as np
+
+from numba import njit
+from PIL import Image
+
 from math import dist
-from collections import deque, defaultdict
+from collections import deque
 from functools import partial, cached_property, lru_cache, singledispatch
 from typing import (
-    Deque, Dict, List, Optional, Set, Tuple, Union, Generator, Collection, Any,
+    Deque, Dict, List, Optional, Set, Tuple, Union, Generator, Collection, Any, Iterator,
 )
 
 from arcade import Sprite, Texture, load_spritesheet, make_soft_square_texture
@@ -20,7 +25,6 @@ from utils.constants import TILE_WIDTH, TILE_HEIGHT, VERTICAL_DIST, DIAGONAL_DIS
 from gameobjects.gameobject import GameObject
 from utils.colors import SAND, WATER_SHALLOW, BLACK
 from utils.data_types import GridPosition, Number
-from utils.priority_queue import PriorityQueue
 from utils.scheduling import EventsCreator
 from utils.functions import (
     get_path_to_file, all_files_of_type_named
@@ -28,7 +32,6 @@ from utils.functions import (
 from map.quadtree import CartesianQuadTree
 from utils.game_logging import log_here, log_this_call
 from utils.timing import timer
-from utils.geometry import calculate_circular_area
 
 # CIRCULAR IMPORTS MOVED TO THE BOTTOM OF FILE!
 
@@ -38,6 +41,23 @@ MAP_TEXTURES = {
         get_path_to_file('mud_tileset_6x6.png'), 60, 50, 4, 16, 0)
 }
 
+# only these transpositions keep width and height of the non-square tiles:
+TERRAIN_TRANSPOSITIONS = (None, Image.FLIP_LEFT_RIGHT, Image.FLIP_TOP_BOTTOM, Image.ROTATE_180)
+
+
+def transpose_terrain_textures(textures: List[Texture]) -> List[List[Texture]]:
+    """Create all transposed variants of each terrain Texture once, instead of transposing them for each tile."""
+    return [
+        [texture if transposition is None else
+         Texture(f'{texture.name}_{transposition}', texture.image.transpose(transposition), hit_box_algorithm='None')
+         for transposition in TERRAIN_TRANSPOSITIONS]
+        for texture in textures
+    ]
+
+
+TRANSPOSED_MAP_TEXTURES = {name: transpose_terrain_textures(textures) for name, textures in MAP_TEXTURES.items()}
+MUD_TEXTURES_VARIANTS = [texture for variants in TRANSPOSED_MAP_TEXTURES['mud'] for texture in variants]
+
 random_value = random.random
 
 MAP_TILE_TEXTURE_GROUND = make_soft_square_texture(TILE_WIDTH, SAND, 255, 255)
@@ -92,19 +112,16 @@ def diagonal(first_grid: GridPosition, second_grid: GridPosition) -> bool:
 
 
 def random_terrain_texture() -> Texture:
-    texture = random.choice(MAP_TEXTURES['mud'])
-    texture.image.transpose(random.randint(0, 6))
-    return texture
+    return random.choice(MUD_TEXTURES_VARIANTS)
 
 
 def set_terrain_texture(terrain_type: str,
                         index: int = None,
                         rotation: int = None) -> Tuple[Texture, int, int]:
-    index = index or random.randint(0, len(MAP_TEXTURES[terrain_type]) - 1)
-    texture: Texture = MAP_TEXTURES[terrain_type][index]
-    rotation = rotation or random.randint(0, 6)
-    texture.image.transpose(rotation)
-    return texture, index, rotation
+    variants = TRANSPOSED_MAP_TEXTURES[terrain_type]
+    index = index or random.randint(0, len(variants) - 1)
+    rotation = rotation or random.randint(0, len(TERRAIN_TRANSPOSITIONS) - 1)
+    return variants[index][rotation], index, rotation
 
 
 @timer(level=2, global_profiling_level=PROFILING_LEVEL, forced=False)
@@ -124,31 +141,12 @@ def a_star(current_map: Map,
     :return: Union[MapPath, bool] -- list of points or False if no path
     found
     """
-    map_nodes = current_map.nodes
-    unexplored = PriorityQueue(start, heuristic(start, end))
-    explored = set()
-    previous: Dict[GridPosition, GridPosition] = {}
-
-    get_best_unexplored = unexplored.get
-    put_to_unexplored = unexplored.put
-
-    cost_so_far = defaultdict(lambda: math.inf)
-    cost_so_far[start] = 0
-
-    while unexplored:
-        if (current := get_best_unexplored()[1]) == end:
-            return reconstruct_path(map_nodes, previous, current)
-        node = map_nodes[current]
-        walkable = node.pathable_adjacent if pathable else node.walkable_adjacent
-        for adjacent in (a for a in walkable if a.grid not in explored):
-            adj_grid = adjacent.grid
-            total = cost_so_far[current] + adjacent_distance(current, adj_grid)
-            if total < cost_so_far[adj_grid]:
-                previous[adj_grid] = current
-                cost_so_far[adj_grid] = total
-                priority = total + heuristic(adj_grid, end)
-                put_to_unexplored(adj_grid, priority)
-            explored.add(current)
+    if start not in current_map or end not in current_map:
+        return False
+    passable = current_map.pathable_grid if pathable else current_map.walkable_grid
+    if len(path := a_star_search(passable, start[0], start[1], end[0], end[1], *current_map.pathfinding_buffers)):
+        positions = current_map.nodes_positions
+        return [positions[node_id] for node_id in path.tolist()]
     # if path was not found searching by walkable tiles, we call second
     # pass and search for pathable nodes this time
     if not pathable:
@@ -156,20 +154,122 @@ def a_star(current_map: Map,
     return False  # no third pass, if there is no possible path!
 
 
-def heuristic(start: GridPosition, end: GridPosition) -> int:
-    dx = abs(start[0] - end[0])
-    dy = abs(start[1] - end[1])
+@njit(nogil=True, cache=True)
+def heap_push(priorities: np.ndarray, ids: np.ndarray, size: int, priority: float, node_id: int) -> int:
+    """Sift the new element up the binary heap kept in two parallel arrays and return new size of the heap."""
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if priorities[parent] <= priority:
+            break
+        priorities[i], ids[i] = priorities[parent], ids[parent]
+        i = parent
+    priorities[i], ids[i] = priority, node_id
+    return size + 1
+
+
+@njit(nogil=True, cache=True)
+def heap_pop(priorities: np.ndarray, ids: np.ndarray, size: int) -> int:
+    """Remove the root of the heap (read it before calling) and return new size of the heap."""
+    size -= 1
+    priority, node_id = priorities[size], ids[size]
+    i, child = 0, 1
+    while child < size:
+        if child + 1 < size and priorities[child + 1] < priorities[child]:
+            child += 1
+        if priorities[child] >= priority:
+            break
+        priorities[i], ids[i] = priorities[child], ids[child]
+        i, child = child, 2 * child + 1
+    priorities[i], ids[i] = priority, node_id
+    return size
+
+
+@njit(nogil=True, cache=True, inline='always')
+def heuristic(start_x: int, start_y: int, end_x: int, end_y: int) -> int:
+    # inlined into the a_star_search loop, it is cheaper than looking the value up in a precomputed table
+    dx = abs(start_x - end_x)
+    dy = abs(start_y - end_y)
     return DIAGONAL_DIST * min(dx, dy) + VERTICAL_DIST * max(dx, dy)
 
 
-def reconstruct_path(map_nodes: Dict[GridPosition, MapNode],
-                     previous_nodes: Dict[GridPosition, GridPosition],
-                     current_node: GridPosition) -> MapPath:
-    path = [map_nodes[current_node]]
-    while current_node in previous_nodes.keys():
-        current_node = previous_nodes[current_node]
-        path.append(map_nodes[current_node])
-    return [node.position for node in path[::-1]]
+@njit(nogil=True, cache=True)
+def reconstruct_path(previous: np.ndarray, current: int) -> np.ndarray:
+    # count path length first, to fill the path array backwards without building and reversing a list:
+    length, node_id = 1, current
+    while previous[node_id] != -1:
+        node_id = previous[node_id]
+        length += 1
+    path = np.empty(length, np.int64)
+    for i in range(length - 1, -1, -1):
+        path[i] = current
+        current = previous[current]
+    return path
+
+
+@njit(['int64[:](uint8[:, ::1], int64, int64, int64, int64, float64[::1], int64[::1], uint8[::1], int64[::1])'],
+      nogil=True, cache=True)
+def a_star_search(passable: np.ndarray,
+                  start_x: int,
+                  start_y: int,
+                  end_x: int,
+                  end_y: int,
+                  cost_so_far: np.ndarray,
+                  previous: np.ndarray,
+                  explored: np.ndarray,
+                  touched: np.ndarray) -> np.ndarray:
+    """
+    Compiled A* working on the flat ids of the MapNodes: id = x * rows + y.
+    Passable is the (columns, rows) array of the 0-1 flags telling if MapNode
+    could be entered. Return ids of the path MapNodes or empty array.
+
+    Cost_so_far, previous, explored and touched are scratch buffers reused
+    between searches (see Map.pathfinding_buffers). Only entries touched by this
+    search are reset before returning.
+    """
+    columns, rows = passable.shape
+    start, end = start_x * rows + start_y, end_x * rows + end_y
+    heap_priorities = np.empty(64, np.float64)
+    heap_ids = np.empty(64, np.int64)
+    path = np.empty(0, np.int64)
+
+    cost_so_far[start] = 0
+    touched[0], touched_count = start, 1
+    heap_size = heap_push(heap_priorities, heap_ids, 0, heuristic(start_x, start_y, end_x, end_y), start)
+    while heap_size:
+        current = heap_ids[0]
+        heap_size = heap_pop(heap_priorities, heap_ids, heap_size)
+        if explored[current]:
+            continue  # stale entry of the node, which was already reached cheaper
+        if current == end:
+            path = reconstruct_path(previous, current)
+            break
+        explored[current] = 1
+        current_x, current_y = current // rows, current % rows
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                adjacent_x, adjacent_y = current_x + dx, current_y + dy
+                if not (0 <= adjacent_x < columns and 0 <= adjacent_y < rows) or (dx == 0 and dy == 0):
+                    continue
+                adjacent = adjacent_x * rows + adjacent_y
+                if explored[adjacent] or not passable[adjacent_x, adjacent_y]:
+                    continue
+                total = cost_so_far[current] + (DIAGONAL_DIST if dx and dy else VERTICAL_DIST)
+                if total < cost_so_far[adjacent]:
+                    if previous[adjacent] == -1:
+                        touched[touched_count] = adjacent
+                        touched_count += 1
+                    previous[adjacent] = current
+                    cost_so_far[adjacent] = total
+                    if heap_size == heap_ids.size:
+                        heap_priorities = np.concatenate((heap_priorities, np.empty_like(heap_priorities)))
+                        heap_ids = np.concatenate((heap_ids, np.empty_like(heap_ids)))
+                    priority = total + heuristic(adjacent_x, adjacent_y, end_x, end_y)
+                    heap_size = heap_push(heap_priorities, heap_ids, heap_size, priority, adjacent)
+    for i in range(touched_count):
+        node_id = touched[i]
+        cost_so_far[node_id], previous[node_id], explored[node_id] = np.inf, -1, 0
+    return path
 
 
 class TerrainType(IntEnum):
@@ -194,7 +294,20 @@ class Map:
         self.nodes_data = map_settings.get('nodes', {})
 
         self.nodes: Dict[GridPosition, MapNode] = {}
-        self.distances = {}
+        # the same MapNodes indexed by [x, y], which allows to slice rectangular areas of the map at once:
+        self.nodes_array = np.empty((self.columns, self.rows), dtype=object)
+        # positions of the MapNodes indexed by their flat ids used in pathfinding: id = x * rows + y
+        self.nodes_positions: List[NormalizedPoint] = []
+        # flags of the MapNodes which could be entered, kept by the MapNodes for the compiled A* search:
+        self.walkable_grid = np.zeros((self.columns, self.rows), dtype=np.uint8)
+        self.pathable_grid = np.zeros((self.columns, self.rows), dtype=np.uint8)
+        # cost_so_far, previous, explored and touched arrays allocated once and reused by each A* search:
+        size = self.columns * self.rows
+        self.pathfinding_buffers = (
+            np.full(size, np.inf), np.full(size, -1, np.int64), np.zeros(size, np.uint8), np.empty(size, np.int64)
+        )
+        # costs of the steps from each MapNode to its neighbours in the ADJACENT_OFFSETS order:
+        self.distances: Optional[np.ndarray] = None
 
         self.quadtree = CartesianQuadTree(self.width // 2, self.height // 2, self.width, self.height)
         log_here(f'Generated QuadTree of depth: {self.quadtree.total_depth()}', console=True)
@@ -258,10 +371,11 @@ class Map:
             return False
 
     def walkable_adjacent(self, x, y) -> Set[MapNode]:
-        return {n for n in self.adjacent_nodes(x, y) if n.is_walkable}
+        # MapNode caches its adjacent nodes, so they are not searched for again:
+        return self.position_to_node(x, y).walkable_adjacent
 
     def pathable_adjacent(self, x, y) -> Set[MapNode]:
-        return {n for n in self.adjacent_nodes(x, y) if n.is_pathable}
+        return self.position_to_node(x, y).pathable_adjacent
 
     def adjacent_nodes(self, x: Number, y: Number) -> Set[MapNode]:
         return {
@@ -274,6 +388,10 @@ class Map:
     def grid_to_node(self, grid: GridPosition) -> MapNode:
         return self.nodes.get(grid)
 
+    def nodes_in_area(self, min_x_grid: int, min_y_grid: int, max_x_grid: int, max_y_grid: int) -> Set[MapNode]:
+        """Return all MapNodes of the rectangular area, max grids are exclusive."""
+        return set(self.nodes_array[max(min_x_grid, 0):max_x_grid, max(min_y_grid, 0):max_y_grid].flat)
+
     @property
     def random_walkable_node(self) -> MapNode:
         return random.choice(tuple(self.all_walkable_nodes))
@@ -285,12 +403,14 @@ class Map:
     @timer(1, global_profiling_level=PROFILING_LEVEL)
     @log_this_call(console=True)
     def generate_map_nodes_and_tiles(self):
-        columns, rows = self.columns, self.rows
-        for x in range(columns):
-            for y in range(rows):
-                terrain = TerrainType.VOID if x in(0, columns) or y in (0, rows) else TerrainType.GROUND
-                self.nodes[(x, y)] = node = MapNode(x, y, terrain)
-                self.create_map_sprite(*node.position, node.terrain_type)
+        terrains = np.full((self.columns, self.rows), TerrainType.GROUND, dtype=np.int8)
+        terrains[0, :] = terrains[:, 0] = TerrainType.VOID
+        terrain_types = tuple(TerrainType)
+        nodes, nodes_array, positions = self.nodes, self.nodes_array, self.nodes_positions
+        for (x, y), terrain in np.ndenumerate(terrains):  # ndenumerate visits nodes in the order of their flat ids
+            nodes[(x, y)] = nodes_array[x, y] = node = MapNode(x, y, terrain_types[terrain])
+            positions.append(node.position)
+            self.create_map_sprite(*node.position, node.terrain_type)
         log_here(f'Generated {len(self.nodes)} map nodes.', console=True)
 
     def create_map_sprite(self, x: int, y: int, terrain_type: TerrainType):
@@ -320,23 +440,21 @@ class Map:
         ...
 
     def calculate_distances_between_nodes(self):
-        for node in self.nodes.values():
-            node.costs = costs_dict = {}
-            for grid in self.is_inside_map_grid(adjacent_map_grids(*node.position)):
-                adjacent_node = self.nodes[grid]
-                distance = adjacent_distance(grid, adjacent_node.grid)
-                # terrain_cost = node.terrain_cost + adjacent_node.terrain_cost
-                node.costs[grid] = distance #  * terrain_cost
-            self.distances[node.grid] = costs_dict
+        columns, rows = self.columns, self.rows
+        self.distances = distances = np.full((columns, rows, len(ADJACENT_OFFSETS)), np.inf, dtype=np.float32)
+        for i, (dx, dy) in enumerate(ADJACENT_OFFSETS):
+            # slice of all MapNodes which neighbour in this direction is still inside the Map:
+            inside = slice(max(-dx, 0), columns - max(dx, 0)), slice(max(-dy, 0), rows - max(dy, 0))
+            distances[(*inside, i)] = DIAGONAL_DIST if dx and dy else VERTICAL_DIST  # * terrain_cost
 
     def get_nodes_by_row(self, row: int) -> List[MapNode]:
-        return [n for n in self.nodes.values() if n.grid[1] == row]
+        return self.nodes_array[:, row].tolist() if 0 <= row < self.rows else []
 
     def get_nodes_by_column(self, column: int) -> List[MapNode]:
-        return [n for n in self.nodes.values() if n.grid[0] == column]
+        return self.nodes_array[column].tolist() if 0 <= column < self.columns else []
 
-    def get_all_nodes(self) -> Generator[MapNode]:
-        return (n for n in self.nodes.values())
+    def get_all_nodes(self) -> Iterator[MapNode]:
+        return self.nodes_array.flat
 
     def get_random_position(self) -> NormalizedPoint:
         return random.choice([n.position for n in self.all_walkable_nodes])
@@ -355,7 +473,7 @@ class Map:
     @cached_property
     def nonexistent_node(self) -> MapNode:
         node = MapNode(-1, -1, TerrainType.VOID)
-        node.is_pathable = node._walkable = False
+        node.is_pathable = False
         return node
 
 
@@ -365,6 +483,8 @@ class MapNode:
     destination and is associated with graphic-map-tiles displayed on the
     screen.
     """
+    __slots__ = ('grid', 'position', 'x', 'y', 'terrain_type', 'map_region', '_pathable', '_tree', '_unit', '_building',
+                 '_static_gameobject', '_adjacent_nodes', '_walkable_adjacent')
     map: Optional[Map] = None
 
     def __init__(self, x: Number, y: Number, terrain_type: TerrainType):
@@ -372,7 +492,6 @@ class MapNode:
         self.position = self.x, self.y = map_grid_to_position(self.grid)
         self.terrain_type: TerrainType = terrain_type
         self.map_region: Optional[int] = None
-        self.costs = None
 
         self._pathable = terrain_type > -1
 
@@ -380,6 +499,9 @@ class MapNode:
         self._unit: Optional[Unit] = None
         self._building: Optional[Building] = None
         self._static_gameobject: Optional[GameObject, TreeID] = None
+        self._adjacent_nodes: Optional[Set[MapNode]] = None
+        self._walkable_adjacent: Optional[Set[MapNode]] = None
+        self.update_pathfinding_grids()
 
     def __str__(self) -> str:
         return f'MapNode(position: {self.position})'
@@ -390,6 +512,14 @@ class MapNode:
     def in_bounds(self, *args, **kwargs):
         return self.map.is_inside_map_grid(*args, **kwargs)
 
+    @property
+    def costs(self) -> Dict[GridPosition, float]:
+        x, y = self.grid
+        return {
+            (x + dx, y + dy): float(cost) for (dx, dy), cost in zip(ADJACENT_OFFSETS, self.map.distances[x, y])
+            if cost != np.inf
+        }
+
     def diagonal_to_other(self, other: GridPosition):
         return self.grid[0] != other[0] and self.grid[1] != other[1]
 
@@ -400,6 +530,7 @@ class MapNode:
     @tree.setter
     def tree(self, value: Optional[TreeID]):
         self._static_gameobject = self._tree = value
+        self.update_walkability()
 
     def remove_tree(self):
         if self._tree is not None:
@@ -414,6 +545,7 @@ class MapNode:
     @unit.setter
     def unit(self, value: Optional[Unit]):
         self._unit = value
+        self.update_walkability()
 
     @property
     def building(self) -> Optional[Building]:
@@ -422,6 +554,7 @@ class MapNode:
     @building.setter
     def building(self, value: Optional[Building]):
         self._static_gameobject = self._building = value
+        self.update_walkability()
 
     @property
     def unit_or_building(self) -> Optional[Union[Unit, Building]]:
@@ -434,6 +567,7 @@ class MapNode:
     @static_gameobject.setter
     def static_gameobject(self, value: Optional[GameObject, TreeID]):
         self._static_gameobject = value
+        self.update_walkability()
 
     @property
     def is_water(self) -> bool:
@@ -455,37 +589,58 @@ class MapNode:
     @is_pathable.setter
     def is_pathable(self, value: bool):
         self._pathable = value
+        self.update_walkability()
+
+    def update_walkability(self):
+        self.update_pathfinding_grids()
+        # cached walkable_adjacent of the neighbours could have become invalid:
+        for node in self.adjacent_nodes:
+            node._walkable_adjacent = None
+
+    def update_pathfinding_grids(self):
+        x, y = self.grid
+        if x >= 0:  # nonexistent_node is not placed on the Map
+            self.map.walkable_grid[x, y] = self.is_walkable
+            self.map.pathable_grid[x, y] = self.is_pathable
 
     @property
     def available_for_construction(self) -> bool:
         return self.is_walkable and self.is_explored()  # and not self.are_buildings_nearby()
 
     def is_explored(self):
-        return self.map.game.editor_mode or self.grid in self.map.game.fog_of_war.explored
+        return self.map.game.editor_mode or self.map.game.fog_of_war.is_explored(self.grid)
 
     def are_buildings_nearby(self):
         return any(n.building for n in self.adjacent_nodes)
 
     @property
     def walkable_adjacent(self) -> Set[MapNode]:
-        return {n for n in self.adjacent_nodes if n.is_walkable}
+        if self._walkable_adjacent is None:
+            self._walkable_adjacent = {n for n in self.adjacent_nodes if n.is_walkable}
+        return self._walkable_adjacent
 
     @property
     def pathable_adjacent(self) -> Set[MapNode]:
         return {n for n in self.adjacent_nodes if n.is_pathable}
 
-    @cached_property
+    @property
     def adjacent_nodes(self) -> Set[MapNode]:
-        return self.map.adjacent_nodes(*self.position)
+        if self._adjacent_nodes is None:  # neighbours of the MapNode never change, so they are found only once
+            self._adjacent_nodes = self.map.adjacent_nodes(*self.position)
+        return self._adjacent_nodes
 
     def __getstate__(self) -> Dict:
-        saved_node = self.__dict__.copy()
+        saved_node = {
+            key: getattr(self, key) for key in self.__slots__ if key not in ('_adjacent_nodes', '_walkable_adjacent')
+        }
         for key in ('_unit', '_building'):
             saved_node[key] = None
         return saved_node
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        for key, value in state.items():
+            setattr(self, key, value)
+        self._adjacent_nodes = self._walkable_adjacent = None
 
 
 class WaypointsQueue:
@@ -742,19 +897,25 @@ class Pathfinder(EventsCreator):
                                required_waypoints: int) -> List[GridPosition]:
         """
         Find requested number of valid waypoints around requested position.
+        Walkable MapNodes are visited from the closest to the center, so the search
+        stops as soon as enough waypoints are found, or when no more are reachable.
         """
         center = position_to_map_grid(x, y)
-        if required_waypoints is 1:
+        if required_waypoints == 1:
             return [center, ]
-        waypoints: List[Tuple[int, int]] = []
-        nodes = self.map.nodes
-        radius = 1
-        while len(waypoints) < required_waypoints:
-            waypoints = [w for w in calculate_circular_area(*center, radius) if
-                         w in nodes and nodes[w].is_walkable]
-            radius += 1
-        waypoints.sort(key=lambda w: dist(w, center))
-        return [d[0] for d in zip(waypoints, range(required_waypoints))]
+        center_node = self.map.node(center)
+        waypoints: List[GridPosition] = []
+        visited = {center}
+        frontier = [(0.0, center, center_node)]
+        while frontier and len(waypoints) < required_waypoints:
+            _, grid, node = heapq.heappop(frontier)
+            if node.is_walkable:
+                waypoints.append(grid)
+            for adjacent in node.walkable_adjacent:
+                if (adjacent_grid := adjacent.grid) not in visited:
+                    visited.add(adjacent_grid)
+                    heapq.heappush(frontier, (dist(adjacent_grid, center), adjacent_grid, adjacent))
+        return waypoints
 
     def get_closest_walkable_position(self, x, y) -> NormalizedPoint:
         if (node := self.map.position_to_node(x, y)).is_walkable:
@@ -73,12 +73,17 @@ class QuadTree(ABC):
         """Find the points in the quadtree that lie within boundary."""
         raise NotImplementedError
 
-    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids):
+    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids, found_entities=None):
+        """Pass a found_entities set to have it filled, instead of allocating a new set for each call."""
+        found_entities = set() if found_entities is None else found_entities
+        if not hostile_factions_ids:
+            return found_entities  # no need to build the Rect and walk the tree, if no one is an enemy
         diameter = radius + radius
         rect = Rect(circle_x, circle_y, diameter, diameter)
-        possible_enemies = []
-        possible_enemies = self.query(hostile_factions_ids, rect, possible_enemies)
-        return {e for e in possible_enemies if dist(e.position, (circle_x, circle_y)) < radius}
+        possible_enemies = self.query(hostile_factions_ids, rect, [])
+        center = rect.position
+        found_entities.update(e for e in possible_enemies if dist(e.position, center) < radius)
+        return found_entities
 
     @abstractmethod
     def insert(self, entity) -> Optional[QuadTree]:
@@ -208,12 +213,17 @@ class CartesianQuadTree(QuadTree, Rect):
             found_entities = quadtree.query(hostile_factions_ids, bounds, found_entities)
         return found_entities
 
-    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids):
+    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids, found_entities=None):
+        """Pass a found_entities set to have it filled, instead of allocating a new set for each call."""
+        found_entities = set() if found_entities is None else found_entities
+        if not hostile_factions_ids:
+            return found_entities  # no need to build the Rect and walk the tree, if no one is an enemy
         diameter = radius + radius
         rect = Rect(circle_x, circle_y, diameter, diameter)
-        possible_enemies = []
-        possible_enemies = self.query(hostile_factions_ids, rect, possible_enemies)
-        return {e for e in possible_enemies if dist(e.position, (circle_x, circle_y)) < radius}
+        possible_enemies = self.query(hostile_factions_ids, rect, [])
+        center = rect.position
+        found_entities.update(e for e in possible_enemies if dist(e.position, center) < radius)
+        return found_entities
 
     @property
     def empty(self):
@@ -317,12 +327,17 @@ class IsometricQuadTree(QuadTree, IsometricRect):
             found_entities = quadtree.query(hostile_factions_ids, bounds, found_entities)
         return found_entities
 
-    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids):
+    def find_visible_entities_in_circle(self, circle_x, circle_y, radius, hostile_factions_ids, found_entities=None):
+        """Pass a found_entities set to have it filled, instead of allocating a new set for each call."""
+        found_entities = set() if found_entities is None else found_entities
+        if not hostile_factions_ids:
+            return found_entities  # no need to build the Rect and walk the tree, if no one is an enemy
         diameter = radius + radius
         rect = Rect(circle_x, circle_y, diameter, diameter)
-        possible_enemies = []
-        possible_enemies = self.query(hostile_factions_ids, rect, possible_enemies)
-        return {e for e in possible_enemies if dist(e.position, (circle_x, circle_y)) < radius}
+        possible_enemies = self.query(hostile_factions_ids, rect, [])
+        center = rect.position
+        found_entities.update(e for e in possible_enemies if dist(e.position, center) < radius)
+        return found_entities
 
     @property
     def empty(self):
@@ -7,14 +7,16 @@ from math import dist
 from abc import abstractmethod
 from collections import defaultdict
 from functools import cached_property
-from typing import Dict, List, Optional, Set, Tuple, Union, Any, Callable
+from typing import Dict, List, Optional, Set, Tuple, Union, Any, Callable, Iterable
+
+import numpy as np
 
 from arcade.arcade_types import Color, Point
 
 from map.quadtree import QuadTree
 from utils.constants import CONSTRUCTION_SITE, TILE_WIDTH, FUEL, FOOD, AMMUNITION, ENERGY, STEEL, ELECTRONICS, \
     CONSCRIPTS, YIELD_PER_SECOND, CONSUMPTION_PER_SECOND, PRODUCTION_EFFICIENCY, RESOURCES, FactionName, \
-    UI_RESOURCES_SECTION
+    UI_RESOURCES_SECTION, UNITS_CHANGED, BUILDINGS_CHANGED, TECHNOLOGY_RESEARCHED
 
 from gameobjects.gameobject import GameObject
 from map.map import MapNode, position_to_map_grid
@@ -207,8 +209,10 @@ class Player(EventsCreator, Observer, Observed):
         attached.faction = self.faction
         if attached.is_unit:
             self._add_unit(attached)
+            self.game.publish_scenario_event(UNITS_CHANGED)
         else:
             self._add_building(attached)
+            self.game.publish_scenario_event(BUILDINGS_CHANGED)
 
     def _add_unit(self, unit: Unit):
         self.units.add(unit)
@@ -223,10 +227,14 @@ class Player(EventsCreator, Observer, Observed):
 
     def on_being_detached(self, detached: Observed):
         detached: Union[Unit, Building]
+        # events are published outside the try, since KeyError raised by the triggered Events must not be swallowed:
         try:
             self._remove_unit(detached)
         except KeyError:
             self._remove_building(detached)
+            self.game.publish_scenario_event(BUILDINGS_CHANGED)
+        else:
+            self.game.publish_scenario_event(UNITS_CHANGED)
 
     def _remove_unit(self, unit: Unit):
         self.units.remove(unit)
@@ -260,12 +268,13 @@ class Player(EventsCreator, Observer, Observed):
     def defeated(self) -> bool:
         return not self.units and not self.buildings
 
-    def knows_all_required(self, required: Tuple[TechnologyId]):
-        return all(technology_id in self.known_technologies for technology_id in required)
+    def knows_all_required(self, required: Iterable[TechnologyId]):
+        return self.known_technologies.issuperset(required)
 
     def update_known_technologies(self, new_technology: Technology):
         self.known_technologies.add(new_technology.id)
         new_technology.gain_technology_effects(researcher=self)
+        self.game.publish_scenario_event(TECHNOLOGY_RESEARCHED)
 
     def kill(self):
         self.detach_observers()
@@ -531,6 +540,8 @@ class PlayerEntity(GameObject):
         # area inside which all map-nodes are visible for this entity:
         self.observed_grids: Set[GridPosition] = set()
         self.observed_nodes: Set[MapNode] = set()
+        # observed_grids packed for the FogOfWar, when observed_grids change, set it to None:
+        self.observed_tiles: Optional[np.ndarray] = None
 
         # like the visibility matrix, but range should be smaller:
         self.attack_radius = self.configs['attack_radius'] * TILE_WIDTH
@@ -642,16 +653,14 @@ class PlayerEntity(GameObject):
         raise NotImplementedError
 
     def on_update(self, delta_time: float = 1/60):
-        if self.is_controlled_by_human_player and self.game.settings.fog_of_war:
-            self.game.fog_of_war.reveal_nodes(self.observed_grids)
+        self.reveal_observed_area()
         self.update_known_enemies_set()
         if self.known_enemies or self._enemy_assigned_by_player:
             self.update_battle_behaviour()
         super().on_update(delta_time)
 
-    @property
-    def should_be_rendered(self) -> bool:
-        return self.on_screen and self in self.game.local_drawn_units_and_buildings
+    def should_be_rendered(self, on_screen: bool) -> bool:
+        return on_screen and self in self.game.local_drawn_units_and_buildings
 
     def update_in_map_quadtree(self):
         self.remove_from_map_quadtree()
@@ -672,6 +681,12 @@ class PlayerEntity(GameObject):
         """
         raise NotImplementedError
 
+    def reveal_observed_area(self):
+        if self.is_controlled_by_human_player and self.game.settings.fog_of_war:
+            if self.observed_tiles is None:
+                self.observed_tiles = self.game.fog_of_war.grids_to_tiles(self.observed_grids)
+            self.game.fog_of_war.reveal_nodes(self.observed_tiles)
+
     def calculate_observed_area(self) -> Set[GridPosition]:
         gx, gy = position_to_map_grid(*self.position)
         circular_map_grid_area = find_area(gx, gy, self.visibility_matrix)
@@ -679,17 +694,19 @@ class PlayerEntity(GameObject):
 
     @ignore_in_editor_mode
     def update_known_enemies_set(self):
-        if enemies := self.scan_for_visible_enemies():
+        # the same set is refilled each frame, instead of being replaced with a new one:
+        self.known_enemies.clear()
+        if enemies := self.scan_for_visible_enemies(self.known_enemies):
             self.player.update_known_enemies(enemies)
-        self.known_enemies = enemies
         if self._targeted_enemy not in enemies:
             self._targeted_enemy = None
 
-    def scan_for_visible_enemies(self) -> Set[PlayerEntity]:
+    def scan_for_visible_enemies(self, found_enemies: Optional[Set[PlayerEntity]] = None) -> Set[PlayerEntity]:
         return self.map.quadtree.find_visible_entities_in_circle(
             *self.position,
             self.visibility_radius,
-            self.faction.enemy_factions
+            self.faction.enemy_factions,
+            found_enemies
         )
 
     @abstractmethod
@@ -716,9 +733,13 @@ class PlayerEntity(GameObject):
 
     def attack(self, enemy):
         if self.ammunition:
-            for weapon in (w for w in self._weapons if w.reloaded()):
-                damage = weapon.shoot(enemy)
-                self.experience += round(damage / weapon.damage, 2)
+            if reloaded := [w for w in self._weapons if w.reloaded()]:
+                conditions_modifier = Weapon.calculate_shot_conditions_modifier(self, enemy)
+                for weapon in reloaded:
+                    # experience grows with each shot, so it is added to the hit chance separately:
+                    hit_chance_modifier = conditions_modifier + self.experience * EXPERIENCE_HIT_CHANCE_BONUS
+                    damage = weapon.shoot(enemy, hit_chance_modifier)
+                    self.experience += round(damage / weapon.damage, 2)
             self.check_if_enemy_destroyed(enemy)
 
     def check_if_enemy_destroyed(self, enemy: PlayerEntity):
@@ -802,7 +823,7 @@ class PlayerEntity(GameObject):
 
 if __name__:
     # these imports are placed here to avoid circular-imports issue:
-    from units.weapons import Weapon
+    from units.weapons import Weapon, EXPERIENCE_HIT_CHANCE_BONUS
     from units.units import Unit, Soldier
     from buildings.buildings import Building, UnitsProducer
     from units.unit_management import SelectedEntityMarker
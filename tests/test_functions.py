@@ -0,0 +1,16 @@
+import unittest
+from unittest import TestCase
+from utils.functions import get_enemies
+
+
+class TestFunctions(TestCase):
+
+    def test_get_enemies(self):
+        wars = [3, 136, 2 ** 31 + 2 ** 16]
+        enemies = [(2, 1), (128, 8), (2 ** 31, 2 ** 16)]
+        for i, war in enumerate(wars):
+            self.assertEqual(get_enemies(war), enemies[i])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
 from unittest import TestCase
-from map.map import normalize_position
+
+import numpy as np
+
+from map.map import normalize_position, a_star_search
 
 
 class TestGridHandler(TestCase):
@@ -15,5 +18,48 @@ class TestGridHandler(TestCase):
             )
 
 
+class TestAStarSearch(TestCase):
+
+    def setUp(self):
+        self.passable = np.ones((5, 5), dtype=np.uint8)
+        size = self.passable.size
+        # the same scratch buffers, which Map allocates once for all searches:
+        self.buffers = (
+            np.full(size, np.inf), np.full(size, -1, np.int64), np.zeros(size, np.uint8), np.empty(size, np.int64)
+        )
+
+    def search(self, start, end) -> list:
+        path = a_star_search(self.passable, *start, *end, *self.buffers)
+        cost_so_far, previous, explored, _ = self.buffers
+        # next search relies on the buffers being reset:
+        self.assertTrue(np.isinf(cost_so_far).all())
+        self.assertTrue((previous == -1).all())
+        self.assertFalse(explored.any())
+        rows = self.passable.shape[1]
+        return [divmod(node_id, rows) for node_id in path.tolist()]
+
+    def test_straight_path(self):
+        self.assertEqual(self.search((0, 2), (4, 2)), [(0, 2), (1, 2), (2, 2), (3, 2), (4, 2)])
+
+    def test_path_around_wall(self):
+        self.passable[2, :4] = 0
+        path = self.search((0, 0), (4, 0))
+        self.assertEqual((path[0], path[-1]), ((0, 0), (4, 0)))
+        self.assertIn((2, 4), path)
+        for (x, y), (next_x, next_y) in zip(path, path[1:]):
+            self.assertEqual(max(abs(next_x - x), abs(next_y - y)), 1)
+            self.assertTrue(self.passable[next_x, next_y])
+
+    def test_unreachable_end(self):
+        self.passable[2, :] = 0
+        self.assertEqual(self.search((0, 0), (4, 0)), [])
+        # buffers must be reset also after the failed search, so the next one still works:
+        self.passable[2, 0] = 1
+        self.assertEqual(len(self.search((0, 0), (4, 0))), 5)
+
+    def test_start_is_end(self):
+        self.assertEqual(self.search((3, 1), (3, 1)), [(3, 1)])
+
+
 if __name__ == '__main__':
     unittest.main()
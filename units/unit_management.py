@@ -14,6 +14,7 @@ from effects.sound import (
 )
 from units.units_tasking import UnitTask, TaskEnterBuilding, TaskAttackMove
 from utils.colors import GREEN, RED, YELLOW
+from utils.constants import UNITS_SELECTED, BUILDING_SELECTED
 from game import Game, UI_WIDTH
 from players_and_factions.player import PlayerEntity
 from units.units import Unit, Vehicle, Soldier
@@ -409,6 +410,7 @@ class UnitsManager(EventsCreator):
         self.selected_building = building
         self.create_building_selection_marker(building=building)
         self.game.change_interface_content(context_gameobjects=building)
+        self.game.publish_scenario_event(BUILDING_SELECTED)
 
     def update_selection_markers_set(self, new: Collection[Unit], lost: Collection[Unit]):
         discarded = {m for m in self.selection_markers if m.selected in lost}
@@ -422,6 +424,7 @@ class UnitsManager(EventsCreator):
         self.create_units_selection_markers(units)
         self.update_types_of_selected_units(units)
         self.game.change_interface_content(context_gameobjects=units)
+        self.game.publish_scenario_event(UNITS_SELECTED)
         if not self.game.editor_mode:
             self.window.sound_player.play_random_sound(UNITS_SELECTION_CONFIRMATIONS)
 
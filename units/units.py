@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import random
-import time
 from enum import IntEnum
 
 from math import dist
@@ -173,6 +172,7 @@ class Unit(PlayerEntity, ABC):
         else:
             self.observed_grids = grids = self.calculate_observed_area()
             self.observed_nodes = {self.map[grid] for grid in grids}
+            self.observed_tiles = None
 
     def update_blocked_map_nodes(self, new_current_node: MapNode):
         """
@@ -232,7 +232,7 @@ class Unit(PlayerEntity, ABC):
         the path with A* algorithm. Instead, Unit 'shelves' currently found
         path and after 1 second 'unshelves' it in countdown_waiting method.
         """
-        self.path_wait_counter = time.time() + 1
+        self.path_wait_counter = self.timer.total_game_time + 1
         self.awaited_path = path.copy()
         self.path.clear()
         self.stop()
@@ -240,8 +240,8 @@ class Unit(PlayerEntity, ABC):
     def find_alternative_path(self) -> Optional[Deque]:
         if len(path := self.path) > 1:
             destination = self.map.position_to_node(*path[1])
-            adjacent = self.current_node.walkable_adjacent
-            for node in (n for n in adjacent if n in destination.walkable_adjacent):
+            # destination's walkable adjacent nodes are found once, instead of once per each adjacent node:
+            for node in self.current_node.walkable_adjacent & destination.walkable_adjacent:
                 self.path[0] = node.position
                 return self.path
 
@@ -268,7 +268,7 @@ class Unit(PlayerEntity, ABC):
             self.stop()
 
     def countdown_waiting(self, path):
-        if time.time() >= self.path_wait_counter:
+        if self.timer.total_game_time >= self.path_wait_counter:
             node = self.map.position_to_node(*path[0])
             if node.is_walkable or len(path) < 20:
                 self.restart_path(path)
@@ -694,9 +694,8 @@ class Soldier(Unit):
             ) for j in range(start, start + ROTATIONS)
         ]
 
-    @property
-    def should_be_rendered(self) -> bool:
-        return self.outside and super().should_be_rendered
+    def should_be_rendered(self, on_screen: bool) -> bool:
+        return self.outside and super().should_be_rendered(on_screen)
 
     @property
     def is_controlled_by_human_player(self) -> bool:
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from random import uniform
 
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from arcade.texture import Texture
 
@@ -23,6 +23,11 @@ BUILDING_HIT_CHANCE_BONUS = 25
 
 class Weapon:
     """Spawn a Weapon instance for each Unit you want to be able to fight."""
+    __slots__ = ('max_ammunition', 'magazine_size', 'owner', 'name', 'object_name', 'game_id', 'damage', 'penetration',
+                 'accuracy', 'range', 'rate_of_fire', 'ammo_per_shot', 'ammo_cost_per_shot', 'next_firing_time',
+                 'shot_sound', 'projectile_sprites', 'ammunition', 'ammo_left_in_magazine')
+    # weapon name -> (attribute name, value) pairs read from the configs, which are the same for each Weapon of a name:
+    attributes_cache: Dict[str, Tuple[Tuple[str, Any], ...]] = {}
 
     def __init__(self, name: str, owner: PlayerEntity):
         self.max_ammunition: int = 0
@@ -36,10 +41,15 @@ class Weapon:
         self.rate_of_fire: float = 4  # 4 seconds
         self.ammo_per_shot = 1
         self.next_firing_time = 0
-        self.shot_sound = '.'.join((name, SOUNDS_EXTENSION))
         self.projectile_sprites: List[Texture] = []
 
-        for attr_name, value in self.owner.game.configs[name].items():
+        if (attributes := Weapon.attributes_cache.get(name)) is None:
+            attributes = Weapon.attributes_cache[name] = (
+                ('shot_sound', '.'.join((name, SOUNDS_EXTENSION))),
+                # 'class' column is used only to spawn objects:
+                *((attr, value) for attr, value in self.owner.game.configs[name].items() if attr in Weapon.__slots__)
+            )
+        for attr_name, value in attributes:
             setattr(self, attr_name, value)
 
         self.ammunition: int = self.max_ammunition
@@ -48,11 +58,11 @@ class Weapon:
     def reloaded(self) -> bool:
         return self.owner.timer.total_game_time >= self.next_firing_time and self.ammunition
 
-    def shoot(self, target: PlayerEntity) -> float:
+    def shoot(self, target: PlayerEntity, hit_chance_modifier: Optional[float] = None) -> float:
         self.next_firing_time = self.owner.timer.total_game_time + self.rate_of_fire
         self.consume_ammunition()
         self.create_shot_audio_visual_effects()
-        if self.check_if_target_was_hit(target):
+        if self.check_if_target_was_hit(target, hit_chance_modifier):
             return target.on_being_damaged(self.damage, self.penetration)
         return 0
 
@@ -64,22 +74,32 @@ class Weapon:
                 self.next_firing_time += (self.rate_of_fire * 4)
         self.ammunition = max(0, self.ammunition - 1)
 
-    def check_if_target_was_hit(self, target: PlayerEntity) -> bool:
+    def check_if_target_was_hit(self, target: PlayerEntity, hit_chance_modifier: Optional[float] = None) -> bool:
+        if hit_chance_modifier is None:
+            hit_chance_modifier = self.calculate_hit_chance_modifier(self.owner, target)
+        return uniform(0, 100) < self.accuracy + hit_chance_modifier
+
+    @staticmethod
+    def calculate_hit_chance_modifier(owner: PlayerEntity, target: PlayerEntity) -> float:
+        return Weapon.calculate_shot_conditions_modifier(owner, target) + owner.experience * EXPERIENCE_HIT_CHANCE_BONUS
+
+    @staticmethod
+    def calculate_shot_conditions_modifier(owner: PlayerEntity, target: PlayerEntity) -> float:
+        """
+        Hit chance modifier without the owner experience, which grows with each
+        shot. It is the same for all Weapons of the owner shooting at the same
+        target, so it can be calculated once for all of them.
+        """
         # we use that booleans are integers we can multiply by other values to avoid if statements
-        hit_chance = sum(
-            (
-                self.accuracy,
-                -target.cover,
-                self.owner.experience * EXPERIENCE_HIT_CHANCE_BONUS,
-                -target.experience * EXPERIENCE_HIT_CHANCE_BONUS,
-                BUILDING_HIT_CHANCE_BONUS * target.is_building,
-                MOVEMENT_HIT_PENALTY * self.owner.is_moving,
-                TARGET_MOVEMENT_HIT_PENALTY * target.is_moving,
-                INFANTRY_HIT_CHANCE_PENALTY * (target.is_infantry - self.owner.is_infantry)
-            )
+        return (
+            -target.cover
+            - target.experience * EXPERIENCE_HIT_CHANCE_BONUS
+            + BUILDING_HIT_CHANCE_BONUS * target.is_building
+            + MOVEMENT_HIT_PENALTY * owner.is_moving
+            + TARGET_MOVEMENT_HIT_PENALTY * target.is_moving
+            + INFANTRY_HIT_CHANCE_PENALTY * (target.is_infantry - owner.is_infantry)
         )
-        return uniform(0, 100) < hit_chance
 
     def create_shot_audio_visual_effects(self):
-        x, y = self.owner.center_x, self.owner.center_y + 10
-        self.owner.game.sound_player.play_sound(self.shot_sound, sound_position=(x, y))
+        owner = self.owner
+        owner.game.sound_player.play_sound(self.shot_sound, sound_position=(owner.center_x, owner.center_y + 10))
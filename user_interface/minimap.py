@@ -62,7 +62,7 @@ class MiniMap:
 
         self.visible = set()
 
-        self.reveal_minimap_area(self.game.fog_of_war.explored)
+        self.reveal_minimap_area(self.game.fog_of_war.mask_to_grids(self.game.fog_of_war.explored_mask))
 
     def set_map_to_mini_map_ratio(self) -> float:
         """
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import time
 from collections import defaultdict
-from functools import partial, singledispatchmethod
+from functools import partial, singledispatchmethod, lru_cache
 
 import PIL
 
@@ -36,6 +36,12 @@ NO_TEXTURE = 'no_texture'
 
 
 def make_texture(width: int, height: int, color: Color) -> Texture:
+    # color can come from a config as a list, which is not hashable:
+    return make_cached_texture(width, height, tuple(color))
+
+
+@lru_cache(maxsize=None)
+def make_cached_texture(width: int, height: int, color: Color) -> Texture:
     """
     Return a :class:`Texture` of a square with the given diameter and color,
     fading out at its edges.
@@ -46,7 +52,7 @@ def make_texture(width: int, height: int, color: Color) -> Texture:
     :param int center_alpha: Alpha value of the square at its center.
     :param int outer_alpha: Alpha value of the square at its edges.
 
-    :returns: New :class:`Texture` object.
+    :returns: New :class:`Texture` object, shared by all callers requesting the same rectangle.
     """
     img = PIL.Image.new("RGBA", (width, height), color)
     name = "{}:{}:{}:{}".format("texture_rect", width, height, color)
@@ -5,8 +5,6 @@ import arcade.color
 from arcade.arcade_types import Color, RGB, RGBA
 from arcade.color import SAND as ARCADE_SAND
 
-from utils.geometry import clamp
-
 
 # RGBA colors:
 RED: Color = (255, 0, 0, 255)
@@ -41,7 +39,8 @@ colors_names = {
 
 
 def rgb_to_rgba(color: RGB, alpha: int) -> RGBA:
-    return color[0], color[1], color[2], clamp(alpha, 255, 0)
+    # clamping is inlined, since colors are made for many sprites and shapes each frame:
+    return color[0], color[1], color[2], 0 if alpha < 0 else 255 if alpha > 255 else alpha
 
 
 def add_transparency(original_color: Color, transparency: int) -> Color:
@@ -53,7 +52,7 @@ def add_transparency(original_color: Color, transparency: int) -> Color:
     :return:
     """
     r, g, b = original_color[:3]
-    return r, g, b, clamp(transparency, 255, 0)
+    return r, g, b, 0 if transparency < 0 else 255 if transparency > 255 else transparency
 
 
 def value_to_color(value, max_value) -> Color:
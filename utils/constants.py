@@ -40,6 +40,14 @@ RESEARCH_FACILITY = 'research_facility'
 PRODUCED_RESOURCE = 'produced_resource'
 PRODUCED_UNITS = 'produced_units'
 
+# scenario events, which EventTriggers could depend on
+UNITS_CHANGED = 'units_changed'
+BUILDINGS_CHANGED = 'buildings_changed'
+TECHNOLOGY_RESEARCHED = 'technology_researched'
+UNITS_SELECTED = 'units_selected'
+BUILDING_SELECTED = 'building_selected'
+VICTORY_POINTS_CHANGED = 'victory_points_changed'
+
 # map
 TILE_WIDTH = 60
 TILE_HEIGHT = 50
@@ -4,24 +4,38 @@ import os
 
 from pathlib import Path
 from functools import lru_cache
+from typing import Optional
 
-from PIL import Image
 from arcade.arcade_types import Color
 
 from utils.colors import colors_names
 from utils.game_logging import log_here
 
 
+# names of all the files in the game directory mapped to their paths, built on the first lookup:
+files_index: Optional[dict[str, Path]] = None
+
+
+def build_files_index() -> dict[str, Path]:
+    index = {}
+    for dirpath, dirnames, filenames in os.walk(os.getcwd()):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            index.setdefault(filename, Path(dirpath, filename))
+    return index
+
+
 @lru_cache
 def get_path_to_file(filename: str, extension: str = 'png') -> Path:
     """
     Build full absolute path to the filename and return it + /filename.
     """
-    correct_filename = add_extension(filename, extension)
-    for dirpath, dirnames, filenames in os.walk(os.getcwd()):
-        if correct_filename in filenames:
-            return Path(dirpath, correct_filename)
-    log_here(f'File {filename} does not exist!', console=True)
+    global files_index
+    if files_index is None:
+        files_index = build_files_index()
+    if (path := files_index.get(add_extension(filename, extension))) is None:
+        log_here(f'File {filename} does not exist!', console=True)
+    return path
 
 
 @lru_cache
@@ -73,23 +87,17 @@ def add_player_color_to_name(name: str, color: Color) -> str:
     return name
 
 
-# def get_enemies(war: int) -> Tuple[int, int]:
-#     """
-#     Since each Player id attribute is a power of 2, id's can
-#     be combined to sum, being a unique identifier, for eg.
-#     Player with id 8 and Player with id 128 make unique sum
-#     136. To save pairs of hostile Players you can sum their
-#     id's and this functions allows to retrieve pair from the
-#     saved value. Limit of Players in game is 16, since 2^32
-#     gives 8589934592, which is highest id checked by functions.
-#     """
-#     index = 8589934592  # 2 to power of 32
-#     while index > 2:
-#         if war < index:
-#             index >>= 1
-#         else:
-#             break
-#     return index, war - index
+def get_enemies(war: int) -> tuple[int, int]:
+    """
+    Since each Player id attribute is a power of 2, id's can
+    be combined to sum, being a unique identifier, for eg.
+    Player with id 8 and Player with id 128 make unique sum
+    136. To save pairs of hostile Players you can sum their
+    id's and this functions allows to retrieve pair from the
+    saved value. Higher id is the highest bit set in the sum.
+    """
+    highest = 1 << (war.bit_length() - 1)
+    return highest, war - highest
 
 
 def ignore_in_editor_mode(func):
@@ -120,9 +128,11 @@ def ignore_in_game(func):
     return wrapper
 
 
+@lru_cache
 def get_texture_size(texture_name: str, rows=1, columns=1) -> tuple[int, int]:
     if '/' not in texture_name:
         texture_name = get_path_to_file(texture_name)
+    from PIL import Image  # imported only when a size is not cached yet
     with Image.open(texture_name) as image:
         width, height = image.size
     return width // columns, height // rows
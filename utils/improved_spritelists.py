@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import Dict, Optional, Union, Iterable, Iterator
 
+import numpy as np
+
 from arcade import SpriteList, Sprite
 
 
@@ -46,6 +48,23 @@ class SpriteListWithSwitch(SpriteList):
         self.draw_on = not self.draw_on
 
 
+class SpriteListWithBatchRemoval(SpriteList):
+    """
+    arcade SpriteList rebuilds its whole index after removing each Sprite, this
+    one allows removing many Sprites at once and rebuilding the index only once.
+    """
+
+    def remove_many(self, sprites: Iterable[Sprite]):
+        removed = set(sprites)
+        self.sprite_list = [s for s in self.sprite_list if s not in removed]
+        self.sprite_idx = {sprite: idx for idx, sprite in enumerate(self.sprite_list)}
+        for sprite in removed:
+            sprite.sprite_lists.remove(self)
+            if self._use_spatial_hash:
+                self.spatial_hash.remove_object(sprite)
+        self._vao1 = None
+
+
 # noinspection PyUnresolvedReferences
 class LayeredSpriteList(SpriteList):
     """
@@ -138,6 +157,34 @@ class LayeredSpriteList(SpriteList):
         if self.update_on:
             for game_object in (gobj for gobj in self if gobj.is_updated):
                 game_object.on_update(delta_time)
+            self.update_visibility()
+
+    def update_visibility(self):
+        """Test all GameObjects against the viewport at once and let updated ones start or stop rendering."""
+        for game_object, on_screen in zip(self.sprite_list, self.find_on_screen()):
+            if game_object.is_updated:
+                game_object.update_visibility(on_screen)
+
+    def update_texture(self, sprite: Sprite):
+        # arcade 2.5.7 updates only texture coordinates here, when the texture is already known to the SpriteList:
+        super().update_texture(sprite)
+        self.update_size(sprite)
+
+    def find_on_screen(self) -> np.ndarray:
+        """
+        Read positions and sizes of the GameObjects straight from the buffers, which arcade 2.5.7 keeps for the
+        batch-drawing (private _sprite_pos_data and _sprite_size_data arrays), instead of asking each GameObject.
+        Buffers are valid only after the first draw and are kept in sync by arcade's update_position and update_size,
+        and by update_texture above. Hit-boxes and angles are ignored, as in GameObject.on_screen.
+        """
+        if self._vao1 is None:  # arcade rebuilds positions and sizes buffers on the next draw
+            return np.fromiter((s.on_screen for s in self.sprite_list), dtype=bool, count=len(self.sprite_list))
+        left, right, bottom, top = self.game.viewport
+        positions = np.frombuffer(self._sprite_pos_data, dtype=np.float32).reshape(-1, 2)
+        half_sizes = np.frombuffer(self._sprite_size_data, dtype=np.float32).reshape(-1, 2) * 0.5
+        x, y = positions[:, 0], positions[:, 1]
+        half_width, half_height = half_sizes[:, 0], half_sizes[:, 1]
+        return (x + half_width > left) & (x - half_width < right) & (y + half_height > bottom) & (y - half_height < top)
 
     def draw(self) -> None:
         if self.draw_on:
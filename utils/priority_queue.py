@@ -7,10 +7,14 @@ from utils.data_types import Number
 
 
 class PriorityQueue:
+    __slots__ = ('elements', '_contains', '_counter')
+
     # much faster than sorting list each frame
     def __init__(self, first_element=None, priority=None):
         self.elements = []
         self._contains = set()  # my improvement, faster lookups
+        # insertion counter breaks ties between equal priorities, so items are never compared:
+        self._counter = 0
         if first_element is not None:
             self.put(first_element, priority)
 
@@ -28,7 +32,10 @@ class PriorityQueue:
 
     def put(self, item, priority):
         self._contains.add(item)
-        heapq.heappush(self.elements, (priority, item))
+        self._counter += 1
+        heapq.heappush(self.elements, (priority, self._counter, item))
 
     def get(self) -> Tuple[Number, Any]:
-        return heapq.heappop(self.elements)  # (priority, item)
+        priority, _, item = heapq.heappop(self.elements)
+        self._contains.discard(item)  # popped item is no longer in the queue
+        return priority, item
@@ -16,19 +16,21 @@ from utils.data_types import Viewport
 Updateable = Drawable = Union[SpriteList, LayeredSpriteList, Sprite]
 
 
-def get_objects_with_attribute(instance: object,
-                               name: str,
-                               ignore: Tuple = ()) -> List[Any]:
+def get_objects_with_attributes(instance: object,
+                                names: Tuple[str, ...],
+                                ignore: Tuple = ()) -> Tuple[List[Any], ...]:
     """
     Search all attributes of <instance> to find all objects which have their
-    own attribute of <name> and return these objects as List. You can also add
-    a Tuple of class names to be ignored during query.
+    own attribute of each of <names> and return these objects as one List for
+    each name. All names are checked in a single pass over the attributes. You
+    can also add a Tuple of class names to be ignored during query.
     """
-    attributes = instance.__dict__.values()
-    return [
-        attr for attr in attributes if
-        hasattr(attr, name) and not isinstance(attr, ignore)
-    ]
+    found = tuple([] for _ in names)
+    for attr in (a for a in instance.__dict__.values() if not isinstance(a, ignore)):
+        for name, objects in zip(names, found):
+            if hasattr(attr, name):
+                objects.append(attr)
+    return found
 
 
 class LoadableWindowView(View):
@@ -83,9 +85,9 @@ class LoadableWindowView(View):
         :param ignored: instead you can declare types of objects, you do not
         want to be updated, nor drawn
         """
-        updated = get_objects_with_attribute(self, 'on_update', ignored)
-        self.drawn = get_objects_with_attribute(self, 'draw', ignored)
-        self.updated = [u for u in updated if u not in ignore_update]
+        updated, self.drawn = get_objects_with_attributes(self, ('on_update', 'draw'), ignored)
+        ignored_ids = {id(obj) for obj in ignore_update}
+        self.updated = [u for u in updated if id(u) not in ignored_ids]
 
     def on_show_view(self):
         log_here(f'Switched to View: {self.__class__.__name__}')